@@ -50,6 +50,8 @@ _ensure_pkg(f"{_PKG}.nodes", BASE_DIR / "nodes", BASE_DIR / "nodes" / "__init__.
 
 _nodes_dir = BASE_DIR / "nodes"
 
+# Node modules only declare their classes: torch/numpy/PIL, the helpers and ops_constants.json are
+# imported on a node's first IS_CHANGED/execution, so registering here stays cheap (bench/bench_import.py).
 ImageOpsBlur = _load_module(f"{_PKG}.nodes.blur", _nodes_dir / "blur.py").ImageOpsBlur
 ImageOpsTransform = _load_module(f"{_PKG}.nodes.transform", _nodes_dir / "transform.py").ImageOpsTransform
 ImageOpsColorAjust = _load_module(f"{_PKG}.nodes.color_ajust", _nodes_dir / "color_ajust.py").ImageOpsColorAjust
@@ -57,6 +59,8 @@ ImageOpsInvert = _load_module(f"{_PKG}.nodes.invert", _nodes_dir / "invert.py").
 ImageOpsClamp = _load_module(f"{_PKG}.nodes.clamp", _nodes_dir / "clamp.py").ImageOpsClamp
 ImageOpsMerge = _load_module(f"{_PKG}.nodes.merge", _nodes_dir / "merge.py").ImageOpsMerge
 ImageOpsPreview = _load_module(f"{_PKG}.nodes.preview", _nodes_dir / "preview.py").ImageOpsPreview
+ImageOpsLoadSequence = _load_module(f"{_PKG}.nodes.load_sequence", _nodes_dir / "load_sequence.py").ImageOpsLoadSequence
+ImageOpsSaveSequence = _load_module(f"{_PKG}.nodes.save_sequence", _nodes_dir / "save_sequence.py").ImageOpsSaveSequence
 
 NODE_CLASS_MAPPINGS = {
     "ImageOpsBlur": ImageOpsBlur,
@@ -66,6 +70,8 @@ NODE_CLASS_MAPPINGS = {
     "ImageOpsClamp": ImageOpsClamp,
     "ImageOpsMerge": ImageOpsMerge,
     "ImageOpsPreview": ImageOpsPreview,
+    "ImageOpsLoadSequence": ImageOpsLoadSequence,
+    "ImageOpsSaveSequence": ImageOpsSaveSequence,
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
@@ -76,6 +82,8 @@ NODE_DISPLAY_NAME_MAPPINGS = {
     "ImageOpsClamp": "ImageOps Clamp",
     "ImageOpsMerge": "ImageOps Merge",
     "ImageOpsPreview": "ImageOps Preview",
+    "ImageOpsLoadSequence": "ImageOps Load Sequence",
+    "ImageOpsSaveSequence": "ImageOps Save Sequence",
 }
 
 __all__ = [
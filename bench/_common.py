@@ -0,0 +1,66 @@
+"""
+Shared bench harness: loads the `nodes` package outside ComfyUI.
+
+Mirrors the root `__init__.py` loader (synthetic package namespace) and stubs `folder_paths`
+with a scratch temp directory so preview savers work without a ComfyUI install. Result memoization
+is forced off: repeated timings of a node entry point must measure the op, not memo hits.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+_PKG = "majoor_imageops"
+
+
+def _stub_folder_paths() -> None:
+    if "folder_paths" in sys.modules:
+        return
+    tmp = tempfile.mkdtemp(prefix="imageops_bench_")
+    mod = types.ModuleType("folder_paths")
+    mod.get_temp_directory = lambda: tmp
+    mod.get_output_directory = lambda: tmp
+    mod.get_input_directory = lambda: tmp
+    sys.modules["folder_paths"] = mod
+
+
+def load_nodes() -> types.ModuleType:
+    os.environ["IMAGEOPS_MEMO_MB"] = "0"  # read when nodes._memo is first imported
+    _stub_folder_paths()
+    for name, path in ((_PKG, ROOT), (f"{_PKG}.nodes", ROOT / "nodes")):
+        mod = sys.modules.get(name)
+        if mod is None:
+            mod = types.ModuleType(name)
+            sys.modules[name] = mod
+        mod.__path__ = [str(path)]
+    return importlib.import_module(f"{_PKG}.nodes")
+
+
+def load(submodule: str) -> types.ModuleType:
+    load_nodes()
+    return importlib.import_module(f"{_PKG}.nodes.{submodule}")
+
+
+def timeit(fn, repeat: int = 5, warmup: int = 1) -> dict:
+    """Run `fn` and return wall-time stats in milliseconds."""
+    for _ in range(max(0, warmup)):
+        fn()
+    samples = []
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return {
+        "min_ms": min(samples),
+        "median_ms": statistics.median(samples),
+        "max_ms": max(samples),
+        "repeat": len(samples),
+    }
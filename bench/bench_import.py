@@ -0,0 +1,167 @@
+"""
+Cold-start cost of the extension: what ComfyUI pays at startup to register the ImageOps nodes.
+
+Every run is a fresh interpreter that loads the root `__init__.py` the way ComfyUI does
+(`spec_from_file_location` under a synthetic module name, `folder_paths` already present), then
+calls every node's INPUT_TYPES (what /object_info does) and finally executes one node. Two
+scenarios: `bare` (nothing preloaded) and `comfyui` (torch, numpy and PIL already imported, as they
+are by the time ComfyUI loads custom nodes). Reported per scenario, as medians over --repeat runs:
+
+- register_ms: executing `__init__.py` (module count and heavy libraries it pulled in alongside)
+- object_info_ms: INPUT_TYPES of every registered node
+- first_exec_ms: first ImageOpsInvert call on a tiny batch (where the helpers get imported)
+
+    python bench/bench_import.py
+    python bench/bench_import.py --save-baseline bench/import_baseline.json
+    python bench/bench_import.py --baseline bench/import_baseline.json --threshold 0.2   # exit 1 on regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCENARIOS = {"bare": "", "comfyui": "torch,numpy,PIL.Image"}
+HEAVY = ("torch", "numpy", "PIL")
+
+_CHILD = r"""
+import importlib, importlib.util, json, sys, tempfile, time, types
+
+root, preload = sys.argv[1], [m for m in sys.argv[2].split(",") if m]
+for name in preload:
+    importlib.import_module(name)
+tmp = tempfile.mkdtemp(prefix="imageops_bench_")
+fp = types.ModuleType("folder_paths")
+fp.get_temp_directory = fp.get_output_directory = fp.get_input_directory = lambda: tmp
+sys.modules["folder_paths"] = fp
+
+def loaded(before):
+    return set(sys.modules) - before
+
+before = set(sys.modules)
+t0 = time.perf_counter()
+spec = importlib.util.spec_from_file_location("ComfyUI-Majoor-ImageOps", root + "/__init__.py")
+mod = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = mod
+spec.loader.exec_module(mod)
+register_ms = (time.perf_counter() - t0) * 1000.0
+added = loaded(before)
+
+t0 = time.perf_counter()
+for cls in mod.NODE_CLASS_MAPPINGS.values():
+    cls.INPUT_TYPES()
+object_info_ms = (time.perf_counter() - t0) * 1000.0
+after_info = loaded(before)
+
+import torch
+
+image = torch.rand(1, 8, 8, 3)
+t0 = time.perf_counter()
+cls = mod.NODE_CLASS_MAPPINGS["ImageOpsInvert"]
+getattr(cls(), cls.FUNCTION)(image=image)
+first_exec_ms = (time.perf_counter() - t0) * 1000.0
+
+heavy = sys.argv[3].split(",")
+print(json.dumps({
+    "register_ms": register_ms,
+    "object_info_ms": object_info_ms,
+    "first_exec_ms": first_exec_ms,
+    "modules": len(added),
+    "heavy": sorted(h for h in heavy if h in added),
+    "heavy_after_object_info": sorted(h for h in heavy if h in after_info),
+    "imageops_modules": sorted(m.split(".", 1)[1] for m in added if m.startswith("majoor_imageops.")),
+}))
+"""
+
+
+def run_once(preload):
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, str(ROOT), preload, ",".join(HEAVY)],
+        check=True, capture_output=True, text=True, cwd=str(ROOT),
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure(preload, repeat):
+    runs = [run_once(preload) for _ in range(max(1, repeat))]
+    row = {"preload": preload.split(",") if preload else []}
+    for key in ("register_ms", "object_info_ms", "first_exec_ms"):
+        values = [r[key] for r in runs]
+        row[key] = round(statistics.median(values), 3)
+        row[key.replace("_ms", "_min_ms")] = round(min(values), 3)
+    last = runs[-1]
+    row.update({k: last[k] for k in ("modules", "heavy", "heavy_after_object_info", "imageops_modules")})
+    return row
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    """Scenarios whose median register_ms grew by more than `threshold` (fraction) and `min_delta_ms`."""
+    regressions = []
+    for name, row in results.items():
+        ref = baseline.get("results", {}).get(name)
+        if not ref or "register_ms" not in ref:
+            continue
+        delta = row["register_ms"] - ref["register_ms"]
+        ratio = row["register_ms"] / max(1e-9, ref["register_ms"])
+        if ratio > 1.0 + threshold and delta > min_delta_ms:
+            regressions.append({"scenario": name, "baseline_ms": ref["register_ms"],
+                                "register_ms": row["register_ms"], "ratio": round(ratio, 3)})
+    return regressions
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of: " + ", ".join(SCENARIOS))
+    ap.add_argument("--repeat", type=int, default=5, help="fresh interpreters per scenario")
+    ap.add_argument("--out", default="", help="write JSON here instead of stdout")
+    ap.add_argument("--save-baseline", default="", help="also write results as a baseline file")
+    ap.add_argument("--baseline", default="", help="compare against this baseline and exit 1 on regression")
+    ap.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown vs baseline (0.2 = +20%%)")
+    ap.add_argument("--min-delta-ms", type=float, default=5.0, help="ignore slowdowns smaller than this")
+    args = ap.parse_args()
+
+    results = {}
+    for name in args.scenarios.split(","):
+        results[name] = measure(SCENARIOS[name], args.repeat)
+        r = results[name]
+        print(f"{name:8s} register {r['register_ms']:8.1f} ms  object_info {r['object_info_ms']:6.1f} ms  "
+              f"first exec {r['first_exec_ms']:8.1f} ms  heavy={','.join(r['heavy']) or '-'}", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        for r in regressions:
+            print(f"REGRESSION {r['scenario']}: {r['baseline_ms']:.1f} -> {r['register_ms']:.1f} ms (x{r['ratio']})",
+                  file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Benchmark suite: every ImageOps op over a resolution x batch x channel matrix, with baseline regression gating.
+
+Each case is timed with `timeit` (median of --repeat runs after one warmup); cells whose input tensor would
+exceed --max-mb are reported as skipped instead of run. Results go to stdout (or --out) as JSON.
+
+    python bench/bench_ops.py --quick
+    python bench/bench_ops.py --save-baseline bench/baseline.json
+    python bench/bench_ops.py --baseline bench/baseline.json --threshold 0.2   # exit 1 on regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+
+from _common import load, load_nodes, timeit
+
+SIZES = {"512": (512, 512), "1080p": (1920, 1080), "4k": (3840, 2160)}
+BATCHES = (1, 16, 256)
+CHANNELS = (3, 4)
+QUICK = {"sizes": ("512", "1080p"), "batches": (1, 4), "channels": (3,)}
+
+
+def _ops():
+    h = load("_helpers")
+    pv = load("_preview")
+    transform = load("transform").ImageOpsTransform()
+
+    def clear_temp(fn):
+        # Preview savers write real files; keep the stub temp dir from growing across repeats.
+        def run(x):
+            out = fn(x)
+            import folder_paths
+
+            temp = folder_paths.get_temp_directory()
+            for name in os.listdir(temp):
+                os.remove(os.path.join(temp, name))
+            return out
+        return run
+
+    return {
+        "blur_r4": lambda x: h._apply_blur(x, 4, 2.0),
+        "blur_r32": lambda x: h._apply_blur(x, 32, 12.0),
+        "color_correct": lambda x: h._apply_color_correct(x, 0.05, 1.1, 0.8, 1.2),
+        "huesat": lambda x: h._apply_huesat(x, 25.0, 1.2, 0.95),
+        "merge_screen": lambda x: h._apply_merge(x, x.flip(2), "screen", 0.8),
+        "sharpen": lambda x: h._apply_sharpen(x, 1.0, 3, 1.5, 0.0),
+        "glow": lambda x: h._apply_glow(x, 0.6, 8, 4.0, 1.0),
+        "crop_reformat": lambda x: h._apply_crop_reformat(x, 16, 16, x.shape[2] // 2, x.shape[1] // 2, 8, "reflect",
+                                                          512, 512, "fit"),
+        "transform_node": lambda x: transform.apply(x, False, 37, -21, 12.5, 0.9, "bilinear", False),
+        "preview_images": clear_temp(lambda x: pv.save_temp_images(x, compression="fast")),
+        "preview_strip": clear_temp(lambda x: pv.save_temp_strip(x, compression="fast")),
+        "preview_webp": clear_temp(lambda x: pv.save_temp_animated(x, ext="webp", compression="fast", max_size=512)),
+    }
+
+
+def _case_key(row):
+    return (row["op"], row["size"], row["batch"], row["channels"])
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    """Cases slower than baseline by more than `threshold` (fraction) and `min_delta_ms` (noise floor)."""
+    base = {_case_key(r): r for r in baseline.get("results", []) if "median_ms" in r}
+    regressions = []
+    for row in results:
+        ref = base.get(_case_key(row))
+        if ref is None or "median_ms" not in row:
+            continue
+        delta = row["median_ms"] - ref["median_ms"]
+        ratio = row["median_ms"] / max(1e-9, ref["median_ms"])
+        if ratio > 1.0 + threshold and delta > min_delta_ms:
+            regressions.append({**row, "baseline_ms": ref["median_ms"], "ratio": round(ratio, 3)})
+    return regressions
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ops", default="", help="comma-separated subset (default: all)")
+    ap.add_argument("--sizes", default=",".join(SIZES))
+    ap.add_argument("--batches", default=",".join(str(b) for b in BATCHES))
+    ap.add_argument("--channels", default=",".join(str(c) for c in CHANNELS))
+    ap.add_argument("--quick", action="store_true", help="small matrix for smoke runs")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--max-mb", type=int, default=1024, help="skip cells whose fp32 input exceeds this")
+    ap.add_argument("--device", default="cpu")
+    ap.add_argument("--out", default="", help="write JSON here instead of stdout")
+    ap.add_argument("--save-baseline", default="", help="also write results as a baseline file")
+    ap.add_argument("--baseline", default="", help="compare against this baseline and exit 1 on regression")
+    ap.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown vs baseline (0.2 = +20%%)")
+    ap.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore slowdowns smaller than this")
+    args = ap.parse_args()
+
+    import torch
+
+    load_nodes()
+    ops = _ops()
+    if args.ops:
+        ops = {k: v for k, v in ops.items() if k in set(args.ops.split(","))}
+    sizes = QUICK["sizes"] if args.quick else tuple(args.sizes.split(","))
+    batches = QUICK["batches"] if args.quick else tuple(int(b) for b in args.batches.split(","))
+    channels = QUICK["channels"] if args.quick else tuple(int(c) for c in args.channels.split(","))
+    repeat = 1 if args.quick else args.repeat
+
+    results = []
+    for size in sizes:
+        w, h = SIZES[size]
+        for c in channels:
+            for b in batches:
+                mb = b * h * w * c * 4 / (1024 * 1024)
+                if mb > args.max_mb:
+                    for name in ops:
+                        results.append({"op": name, "size": size, "batch": b, "channels": c,
+                                        "skipped": f"input {mb:.0f} MB > --max-mb"})
+                    continue
+                torch.manual_seed(0)
+                x = torch.rand(b, h, w, c, device=args.device)
+                for name, op in ops.items():
+                    t = timeit(lambda: op(x), repeat=repeat)
+                    results.append({
+                        "op": name, "size": size, "batch": b, "channels": c,
+                        "median_ms": round(t["median_ms"], 3),
+                        "min_ms": round(t["min_ms"], 3),
+                        "mpix_per_s": round(b * h * w / 1e6 / max(1e-9, t["median_ms"] / 1000.0), 2),
+                    })
+                    print(f"{name:16s} {size:6s} b={b:<4d} c={c} {t['median_ms']:10.2f} ms", file=sys.stderr)
+                del x
+
+    report = {
+        "meta": {
+            "torch": torch.__version__,
+            "threads": torch.get_num_threads(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "device": args.device,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        for r in regressions:
+            print(f"REGRESSION {r['op']} {r['size']} b={r['batch']} c={r['channels']}: "
+                  f"{r['baseline_ms']:.2f} -> {r['median_ms']:.2f} ms (x{r['ratio']})", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Accuracy vs speed of each op under IMAGEOPS_PRECISION modes (fp32 reference vs fp16 / bf16).
+
+Inputs for the reduced modes are handed over already in that dtype, as a half-precision
+upstream node would. Errors are reported in 8-bit levels against the fp32 result.
+
+    python bench/bench_precision.py --size 1920x1080 --batch 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+from _common import load, timeit
+
+
+def _ops(h):
+    return {
+        "color_correct": lambda x: h._apply_color_correct(x, 0.05, 1.1, 0.8, 1.2),
+        "levels": lambda x: h._apply_levels(x, 0.05, 0.95, 1.3, 0.0, 1.0),
+        "huesat": lambda x: h._apply_huesat(x, 25.0, 1.2, 0.95),
+        "invert": lambda x: h._apply_invert(x),
+        "clamp": lambda x: h._apply_clamp(x, 0.1, 0.9),
+        "blur_r4": lambda x: h._apply_blur(x, 4, 2.0),
+        "blur_r32": lambda x: h._apply_blur(x, 32, 12.0),
+        "sharpen": lambda x: h._apply_sharpen(x, 1.0, 3, 1.5, 0.0),
+        "glow": lambda x: h._apply_glow(x, 0.6, 8, 4.0, 1.0),
+        "edge_detect": lambda x: h._apply_edge_detect(x, 1.0),
+        "merge_screen": lambda x: h._apply_merge(x, x.flip(2), "screen", 0.8),
+        "transform": lambda x: h._apply_transform(x, 10, -5, 15.0, 0.9, "bilinear", False),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", default="1920x1080")
+    ap.add_argument("--batch", type=int, default=2)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--modes", default="fp16,bf16")
+    args = ap.parse_args()
+
+    import torch
+
+    h = load("_helpers")
+    w, hh = (int(v) for v in args.size.lower().split("x"))
+    torch.manual_seed(0)
+    x32 = torch.rand(args.batch, hh, w, 3)
+    results = []
+    for name, op in _ops(h).items():
+        h.PRECISION = "fp32"
+        ref = op(x32)
+        row = {"op": name, "fp32_ms": round(timeit(lambda: op(x32), repeat=args.repeat)["median_ms"], 2)}
+        for mode in args.modes.split(","):
+            h.PRECISION = mode
+            xin = x32.to(h._PRECISION_DTYPES[mode])
+            out = op(xin).float()
+            err = (out - ref).abs() * 255.0
+            row[f"{mode}_ms"] = round(timeit(lambda: op(xin), repeat=args.repeat)["median_ms"], 2)
+            row[f"{mode}_mean_err_8bit"] = round(float(err.mean()), 4)
+            row[f"{mode}_max_err_8bit"] = round(float(err.max()), 3)
+        h.PRECISION = "fp32"
+        results.append(row)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
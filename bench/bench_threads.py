@@ -0,0 +1,96 @@
+"""
+CPU scaling of the ImageOps scheduler: throughput per op for IMAGEOPS_CPU_WORKERS from 1 to N cores.
+
+Each row runs `run_batched` (or `run_pointwise`) with `workers` frame-parallel workers sharing the cores
+(torch intra-op threads = cores // workers), next to plain torch intra-op scaling (workers=1, threads=cores).
+Every parallel output is checked against the serial one with torch.equal.
+
+    python bench/bench_threads.py --size 1920x1080 --batch 32
+    python bench/bench_threads.py --cores 1,2,4,8,16,32,64 --ops edge_detect,merge_screen
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+from _common import load, timeit
+
+
+def _ops(h, ex):
+    return {
+        "edge_detect": lambda x: ex.run_batched(lambda t: h._apply_edge_detect(t, 1.0), x, halo=1),
+        "merge_screen": lambda x: ex.run_batched(lambda a, b: h._apply_merge(a, b, "screen", 0.8), x, x[:1], halo=0),
+        "blur_r4": lambda x: ex.run_batched(lambda t: h._apply_blur(t, 4, 2.0), x, halo=4),
+        "color_correct": lambda x: ex.run_batched(lambda t: h._apply_color_correct(t, 0.05, 1.1, 0.8, 1.2), x,
+                                                  halo=0),
+        "invert_fused": lambda x: ex.run_pointwise(lambda t: h._apply_invert(t), x),
+    }
+
+
+def _core_counts(arg):
+    if arg:
+        return [int(c) for c in arg.split(",")]
+    n = os.cpu_count() or 1
+    counts, c = [], 1
+    while c < n:
+        counts.append(c)
+        c *= 2
+    return counts + [n]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", default="1920x1080")
+    ap.add_argument("--batch", type=int, default=32)
+    ap.add_argument("--ops", default="", help="comma-separated subset (default: all)")
+    ap.add_argument("--cores", default="", help="core counts to test (default: powers of 2 up to cpu_count)")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    import torch
+
+    h = load("_helpers")
+    ex = load("_exec")
+    ops = _ops(h, ex)
+    if args.ops:
+        ops = {k: v for k, v in ops.items() if k in set(args.ops.split(","))}
+    w, hh = (int(v) for v in args.size.lower().split("x"))
+    torch.manual_seed(0)
+    x = torch.rand(args.batch, hh, w, 3)
+    mpix = args.batch * w * hh / 1e6
+
+    results = []
+    for name, op in ops.items():
+        torch.set_num_threads(1)
+        ex.CPU_WORKERS = 1
+        ref = op(x)
+        for cores in _core_counts(args.cores):
+            for workers in sorted({1, cores}):
+                torch.set_num_threads(cores)
+                ex.CPU_WORKERS = workers
+                out = op(x)
+                t = timeit(lambda: op(x), repeat=args.repeat)
+                row = {
+                    "op": name, "cores": cores, "workers": workers, "intra_threads": max(1, cores // workers),
+                    "median_ms": round(t["median_ms"], 2),
+                    "mpix_per_s": round(mpix / max(1e-9, t["median_ms"] / 1000.0), 2),
+                    "equal_to_serial": bool(torch.equal(out, ref)),
+                }
+                results.append(row)
+                print(f"{name:14s} cores={cores:<3d} workers={workers:<3d} {row['median_ms']:10.2f} ms "
+                      f"{row['mpix_per_s']:8.2f} Mpix/s equal={row['equal_to_serial']}", file=sys.stderr)
+    ex.CPU_WORKERS = 1
+
+    base = {(r["op"]): r["mpix_per_s"] for r in results if r["cores"] == 1}
+    for r in results:
+        r["speedup"] = round(r["mpix_per_s"] / max(1e-9, base[r["op"]]), 2)
+    print(json.dumps({"meta": {"torch": torch.__version__, "cpu_count": os.cpu_count(), "size": args.size,
+                               "batch": args.batch}, "results": results}, indent=2))
+    return 0 if all(r["equal_to_serial"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+ImageOpsTransform: tensor engine vs the legacy PIL round trip.
+
+The legacy path (tensor -> PIL -> resize -> rotate -> paste -> tensor) only ever handled frame 0,
+so it is timed per frame and scaled by the batch size for a like-for-like comparison.
+
+    python bench/bench_transform.py --batch 4 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+from _common import load, timeit
+
+SIZES = {"1080p": (1920, 1080), "4k": (3840, 2160)}
+
+
+def _legacy_pil(helpers, frame, translate_x, translate_y, rotate_deg, scale, filter, expand):
+    from PIL import Image
+
+    pil = helpers._tensor_to_pil(frame)
+    resample = {"nearest": Image.NEAREST, "bilinear": Image.BILINEAR, "bicubic": Image.BICUBIC}[filter]
+    if abs(scale - 1.0) > helpers.EPSILON:
+        w, h = pil.size
+        pil = pil.resize((max(1, int(round(w * scale))), max(1, int(round(h * scale)))), resample=resample)
+    if abs(rotate_deg) > helpers.EPSILON:
+        pil = pil.rotate(rotate_deg, resample=resample, expand=bool(expand))
+    if translate_x or translate_y:
+        canvas = Image.new(pil.mode, pil.size, (0, 0, 0, 0) if pil.mode == "RGBA" else (0, 0, 0))
+        canvas.paste(pil, (translate_x, translate_y))
+        pil = canvas
+    return helpers._pil_to_tensor(pil)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--batch", type=int, default=4)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--channels", type=int, default=3)
+    ap.add_argument("--filter", default="bilinear", choices=["nearest", "bilinear", "bicubic"])
+    ap.add_argument("--device", default="cpu")
+    args = ap.parse_args()
+
+    import torch
+
+    helpers = load("_helpers")
+    params = dict(translate_x=37, translate_y=-21, rotate_deg=12.5, scale=0.9, filter=args.filter, expand=True)
+    results = []
+    for label, (w, h) in SIZES.items():
+        batch = torch.rand(args.batch, h, w, args.channels, device=args.device)
+        legacy = timeit(lambda: _legacy_pil(helpers, batch[:1], **params), repeat=args.repeat)
+        tensor = timeit(lambda: helpers._apply_transform(batch, **params), repeat=args.repeat)
+        legacy_batch_ms = legacy["median_ms"] * args.batch
+        results.append({
+            "size": label,
+            "batch": args.batch,
+            "channels": args.channels,
+            "filter": args.filter,
+            "legacy_pil_ms_per_batch": round(legacy_batch_ms, 2),
+            "tensor_ms_per_batch": round(tensor["median_ms"], 2),
+            "speedup": round(legacy_batch_ms / max(1e-9, tensor["median_ms"]), 2),
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
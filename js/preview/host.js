@@ -6,7 +6,7 @@ import { detectSourceUpstream, isGraphTooLarge, findDependents } from "./graph.j
 import { attachProgressBus } from "./progress.js";
 import { getPreviewConfig } from "./config.js";
 import { getOpsConstants, initOpsConstants } from "./constants.js";
-import { computeScopes, drawHistogram, drawWaveform, drawRgbWaveform, drawVectorscope } from "./scopes.js";
+import { computeScopes, scopesFromServer, drawHistogram, drawWaveform, drawRgbWaveform, drawVectorscope } from "./scopes.js";
 
 console.info("[ImageOps] LivePreview v6 loaded");
 
@@ -32,6 +32,9 @@ function ensureState(node) {
     hooked: false,
     canvas: null,
     scopes: null,
+    serverPayload: null,
+    serverScopes: null,
+    serverFrame: -1,
     abCanvas: null,
     abEnabled: false,
     wipe: 0.5,
@@ -349,42 +352,84 @@ function blit(st, imgCanvas, canvasSize) {
     } catch {}
   }
 
-  // Scopes (downsampled for perf)
+  // Scopes: exact server bins from the last execution if present, else computed from the canvas (downsampled for perf)
   if (st.scopes && (st.showHistogram || st.showWaveform || st.showVectorscope)) {
     try {
-      const img = ctx.getImageData(0, 0, canvasSize, canvasSize);
-      const { luma_weights: LW } = getOpsConstants();
-      const s = computeScopes(img, {
-        lumaWeights: LW,
-        sampleStep: canvasSize >= 768 ? 4 : 2,
-        waveWidth: st.scopes.histCanvas.width,
-        waveHeight: st.scopes.histCanvas.height,
-        vectorscopeSize: st.scopes.vecCanvas.width,
-      });
-      if (st.showHistogram) {
-        drawHistogram(st.scopes.histCanvas.getContext("2d"), st.scopes.histCanvas.width, st.scopes.histCanvas.height, s.hist);
-      } else {
-        st.scopes.histCanvas.getContext("2d").clearRect(0, 0, st.scopes.histCanvas.width, st.scopes.histCanvas.height);
-      }
-      if (st.showWaveform) {
-        const wctx = st.scopes.waveCanvas.getContext("2d");
-        if (st.waveformMode === "rgb") {
-          drawRgbWaveform(wctx, st.scopes.waveCanvas.width, st.scopes.waveCanvas.height, s.waveformR, s.waveformG, s.waveformB, s.waveW, s.waveH);
-        } else {
-          drawWaveform(wctx, st.scopes.waveCanvas.width, st.scopes.waveCanvas.height, s.waveform, s.waveW, s.waveH);
-        }
-      } else {
-        st.scopes.waveCanvas.getContext("2d").clearRect(0, 0, st.scopes.waveCanvas.width, st.scopes.waveCanvas.height);
-      }
-      if (st.showVectorscope) {
-        drawVectorscope(st.scopes.vecCanvas.getContext("2d"), st.scopes.vecCanvas.width, s.vectorscope, s.vecSize);
-      } else {
-        st.scopes.vecCanvas.getContext("2d").clearRect(0, 0, st.scopes.vecCanvas.width, st.scopes.vecCanvas.height);
+      let s = st.serverScopes;
+      if (!s) {
+        const img = ctx.getImageData(0, 0, canvasSize, canvasSize);
+        const { luma_weights: LW } = getOpsConstants();
+        s = computeScopes(img, {
+          lumaWeights: LW,
+          sampleStep: canvasSize >= 768 ? 4 : 2,
+          waveWidth: st.scopes.histCanvas.width,
+          waveHeight: st.scopes.histCanvas.height,
+          vectorscopeSize: st.scopes.vecCanvas.width,
+        });
       }
+      drawScopes(st, s);
     } catch {}
   }
 }
 
+// Server bins for the frame selected in the node's image gallery; the batch aggregate when none is
+// selected or the payload carries no bins for that frame.
+function selectServerScopes(node, st) {
+  const payload = st.serverPayload;
+  if (!payload) return null;
+  const idx = Number.isInteger(node.imageIndex) && payload.per_frame?.[node.imageIndex] ? node.imageIndex : -1;
+  if (!st.serverScopes || st.serverFrame !== idx) {
+    st.serverScopes = scopesFromServer(payload, idx);
+    st.serverFrame = idx;
+  }
+  return st.serverScopes;
+}
+
+function showServerScopes(node, st) {
+  const s = selectServerScopes(node, st);
+  if (!s || !st.scopes) return;
+  try { drawScopes(st, s); } catch {}
+  if (st.info) {
+    const what = st.serverFrame >= 0 ? `frame ${st.serverFrame + 1}/${s.frames}` : `${s.frames} frame(s)`;
+    st.info.textContent = `Scopes: server (${what}, full resolution)`;
+  }
+}
+
+function drawScopes(st, s) {
+  if (st.showHistogram) {
+    drawHistogram(st.scopes.histCanvas.getContext("2d"), st.scopes.histCanvas.width, st.scopes.histCanvas.height, s.hist);
+  } else {
+    st.scopes.histCanvas.getContext("2d").clearRect(0, 0, st.scopes.histCanvas.width, st.scopes.histCanvas.height);
+  }
+  if (st.showWaveform) {
+    const wctx = st.scopes.waveCanvas.getContext("2d");
+    if (st.waveformMode === "rgb") {
+      drawRgbWaveform(wctx, st.scopes.waveCanvas.width, st.scopes.waveCanvas.height, s.waveformR, s.waveformG, s.waveformB, s.waveW, s.waveH);
+    } else {
+      drawWaveform(wctx, st.scopes.waveCanvas.width, st.scopes.waveCanvas.height, s.waveform, s.waveW, s.waveH);
+    }
+  } else {
+    st.scopes.waveCanvas.getContext("2d").clearRect(0, 0, st.scopes.waveCanvas.width, st.scopes.waveCanvas.height);
+  }
+  if (st.showVectorscope) {
+    drawVectorscope(st.scopes.vecCanvas.getContext("2d"), st.scopes.vecCanvas.width, s.vectorscope, s.vecSize);
+  } else {
+    st.scopes.vecCanvas.getContext("2d").clearRect(0, 0, st.scopes.vecCanvas.width, st.scopes.vecCanvas.height);
+  }
+}
+
+// In-memory previews (IMAGEOPS_PREVIEW_MEMORY): bytes are served by the extension route, not /view.
+function showMemoryPreviews(node, items) {
+  if (!Array.isArray(items) || !items.length) return;
+  node.imgs = items.map((it) => {
+    const img = new Image();
+    img.onload = () => app.graph?.setDirtyCanvas?.(true, true);
+    img.src = api.apiURL(`/imageops/preview/${encodeURIComponent(it.filename)}`);
+    return img;
+  });
+  node.imageIndex = items.length === 1 ? 0 : null;
+}
+
 export function registerImageOpsLivePreview() {
   initOpsConstants();
   const cfg = getPreviewConfig();
@@ -424,6 +469,9 @@ export function registerImageOpsLivePreview() {
   function startLoopIfVideo(node) {
     const st = ensurePreviewWidget(node, progress, canvasSize);
     if (!st) return;
+    // Graph edited since the last execution: server scopes no longer describe what is shown.
+    st.serverPayload = null;
+    st.serverScopes = null;
 
     const src = detectSourceUpstream(node);
     if (!src || src.kind !== "video") {
@@ -487,6 +535,30 @@ export function registerImageOpsLivePreview() {
   app.registerExtension({
     name: EXT_NAME,
     async beforeRegisterNodeDef(nodeType, nodeData) {
+      if (nodeData?.name === "ImageOpsPreview") {
+        nodeType.prototype.onExecuted = (function (orig) {
+          return function (message) {
+            orig?.apply(this, arguments);
+            const st = ensureState(this);
+            showMemoryPreviews(this, message?.imageops_memory);
+            st.serverPayload = message?.imageops_scopes?.[0] ?? null;
+            st.serverScopes = null;
+            showServerScopes(this, st);
+          };
+        })(nodeType.prototype.onExecuted);
+        // Picking a frame in the image gallery switches the scopes to that frame's bins (per_frame mode).
+        nodeType.prototype.onDrawForeground = (function (orig) {
+          return function () {
+            const r = orig?.apply(this, arguments);
+            const st = this.__imageops_state;
+            if (st?.serverPayload?.per_frame) {
+              const idx = Number.isInteger(this.imageIndex) && st.serverPayload.per_frame[this.imageIndex] ? this.imageIndex : -1;
+              if (idx !== st.serverFrame) showServerScopes(this, st);
+            }
+            return r;
+          };
+        })(nodeType.prototype.onDrawForeground);
+      }
       nodeType.prototype.onNodeCreated = (function (orig) {
         return function () {
           orig?.apply(this, arguments);
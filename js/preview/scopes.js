@@ -57,6 +57,37 @@ export function computeScopes(imageData, opts) {
   return { hist, waveform, waveformR, waveformG, waveformB, waveW, waveH, vectorscope, vecSize };
 }
 
+// Server-side bins (ImageOpsPreview `scopes` input, ui key `imageops_scopes`) -> computeScopes() shape.
+// frame < 0 (or missing per-frame data) selects the batch aggregate.
+function decodeUint32(b64) {
+  const bin = atob(b64);
+  const view = new DataView(new ArrayBuffer(bin.length));
+  for (let i = 0; i < bin.length; i++) view.setUint8(i, bin.charCodeAt(i));
+  const out = new Float64Array(bin.length >> 2);
+  for (let i = 0; i < out.length; i++) out[i] = view.getUint32(i * 4, true);
+  return out;
+}
+
+export function scopesFromServer(payload, frame = -1) {
+  const src = (frame >= 0 ? payload?.per_frame?.[frame] : null) ?? payload?.aggregate;
+  if (!src) return null;
+  // Float64Array: aggregated counts over long batches can exceed 32-bit. Per-frame bins arrive as
+  // base64 little-endian uint32 ("base64_uint32le").
+  const arr = (v) => (typeof v === "string" ? decodeUint32(v) : Float64Array.from(v ?? []));
+  return {
+    hist: arr(src.hist),
+    waveform: arr(src.waveform),
+    waveformR: arr(src.waveform_r),
+    waveformG: arr(src.waveform_g),
+    waveformB: arr(src.waveform_b),
+    waveW: payload.wave_width,
+    waveH: payload.wave_height,
+    vectorscope: arr(src.vectorscope),
+    vecSize: payload.vec_size,
+    frames: payload.frames,
+  };
+}
+
 export function drawHistogram(ctx, W, H, hist) {
   ctx.setTransform(1, 0, 0, 1, 0, 0);
   ctx.clearRect(0, 0, W, H);
@@ -6,6 +6,8 @@ from .invert import ImageOpsInvert
 from .clamp import ImageOpsClamp
 from .merge import ImageOpsMerge
 from .preview import ImageOpsPreview
+from .load_sequence import ImageOpsLoadSequence
+from .save_sequence import ImageOpsSaveSequence
 
 __all__ = [
     "ImageOpsBlur",
@@ -15,4 +17,6 @@ __all__ = [
     "ImageOpsClamp",
     "ImageOpsMerge",
     "ImageOpsPreview",
+    "ImageOpsLoadSequence",
+    "ImageOpsSaveSequence",
 ]
@@ -0,0 +1,311 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import torch
+
+from ._helpers import (
+    _blend_with_mask,
+    _compute_dtype,
+    _is_channels_first,
+    _prepare_mask_tensor,
+    CHUNK_BUDGET_MB,
+    CPU_WORKERS,
+    MASK_ROI,
+    TILE_SIZE,
+)
+from ._spill import empty_batch, is_spilled, should_spill, SPILL_MB
+
+# Pixels per fused block: large enough to amortize Python dispatch, small enough for temporaries to stay cache-sized.
+_POINTWISE_BLOCK_PIXELS = 1 << 18
+# Masked ops fall back to whole frames once the boxes to process exceed this share of the batch (the ROI path
+# also copies the source, so a dense mask gains nothing).
+_ROI_MAX_COVERAGE = 0.5
+
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+_LOCAL = threading.local()
+
+
+def _pool(workers):
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None or _POOL[0] != workers:
+            if _POOL is not None:
+                _POOL[1].shutdown(wait=False)
+            _POOL = (workers, ThreadPoolExecutor(max_workers=workers, thread_name_prefix="imageops_cpu"))
+        return _POOL[1]
+
+
+def _run_units(units, work, device):
+    """
+    Call `work(unit)` for every unit: in order, or concurrently on IMAGEOPS_CPU_WORKERS threads for CPU
+    tensors. Torch intra-op threads are split between the workers (cores // workers each) instead of
+    every worker fanning out over all cores. Units write disjoint output regions with the same per-unit
+    math, so the result equals serial execution.
+    """
+    units = list(units)
+    workers = min(CPU_WORKERS, len(units))
+    if workers <= 1 or device.type != "cpu" or getattr(_LOCAL, "worker", False):
+        for u in units:
+            work(u)
+        return
+    total = torch.get_num_threads()
+    intra = max(1, total // workers)
+
+    def task(u):
+        _LOCAL.worker = True  # nested runs stay serial inside a worker
+        torch.set_num_threads(intra)  # OpenMP thread count is per calling thread
+        work(u)
+
+    try:
+        futures = [_pool(workers).submit(task, u) for u in units]
+        wait(futures)
+        for f in futures:
+            f.result()
+    finally:
+        torch.set_num_threads(total)
+
+
+class _Output:
+    """Output allocated from the first finished unit's result (units may finish in any order)."""
+
+    def __init__(self, make):
+        self._make = make
+        self._lock = threading.Lock()
+        self.tensor = None
+
+    def get(self, res):
+        if self.tensor is None:
+            with self._lock:
+                if self.tensor is None:
+                    self.tensor = self._make(res)
+        return self.tensor
+
+
+def _parallel_step(chunk, B):
+    """Frames per unit: the memory-budget chunk, split across CPU workers when they are enabled."""
+    if CPU_WORKERS <= 1:
+        return chunk
+    return max(1, -(-min(chunk, B) // CPU_WORKERS))
+
+
+def _mask_bbox(mask_tensor):
+    """(y0, y1, x0, x1) bounding all nonzero weights of a [b,H,W] mask slice, or None when it is all zero."""
+    if mask_tensor.shape[0] > 1 and mask_tensor.stride(0) == 0:
+        mask_tensor = mask_tensor[:1]  # single-frame mask broadcast over the batch
+    nz = mask_tensor > 0
+    ys = torch.nonzero(nz.any(dim=2).any(dim=0))
+    if ys.numel() == 0:
+        return None
+    xs = torch.nonzero(nz.any(dim=1).any(dim=0))
+    return int(ys[0]), int(ys[-1]) + 1, int(xs[0]), int(xs[-1]) + 1
+
+
+def _grow(box, halo, H, W):
+    y0, y1, x0, x1 = box
+    return max(0, y0 - halo), min(H, y1 + halo), max(0, x0 - halo), min(W, x1 + halo)
+
+
+def _box_area(box, frames=1):
+    return 0 if box is None else frames * (box[1] - box[0]) * (box[3] - box[2])
+
+
+def _roi_output(image, dtype):
+    """The source in the output dtype (what the mask blend yields outside the mask), as a fresh tensor."""
+    dtype = torch.promote_types(image.dtype, dtype)
+    if should_spill(image.numel() * torch.finfo(dtype).bits // 8, image.device):
+        return empty_batch(tuple(image.shape), dtype, image.device).copy_(image)
+    return image.to(dtype, copy=True)
+
+
+def run_pointwise(fn, image, *others, mask=None):
+    """
+    Evaluate a chain of pointwise ops in one pass, block of rows by block of rows.
+
+    `fn(x, *others)` receives matching [rows,W,C] slices (others with batch 1 are broadcast),
+    so every intermediate is block-sized and the only full-size allocation is the output.
+    The optional mask blend is folded into the same pass; with a sparse mask only the blocks
+    inside each frame's mask bounding box are evaluated.
+    """
+    B, H, W, _ = image.shape
+    mask_tensor = _prepare_mask_tensor(mask, B, H, W, image.device, image.dtype)
+    boxes = None
+    if mask_tensor is not None and MASK_ROI:
+        boxes = [_mask_bbox(mask_tensor[b:b + 1]) for b in range(B)]
+        if sum(_box_area(box) for box in boxes) > _ROI_MAX_COVERAGE * B * H * W:
+            boxes = None
+
+    if boxes is None:
+        out = _Output(lambda res: empty_batch((B, H, W, res.shape[-1]), res.dtype, res.device))
+    else:
+        out = _Output(lambda res: _roi_output(image, res.dtype))
+
+    def frame(b):
+        y0, y1, x0, x1 = (0, H, 0, W) if boxes is None else (boxes[b] or (0, 0, 0, 0))
+        rows = max(1, min(H, _POINTWISE_BLOCK_PIXELS // max(1, x1 - x0)))
+        for r0 in range(y0, y1, rows):
+            r1 = min(y1, r0 + rows)
+            src = image[b, r0:r1, x0:x1]
+            res = fn(src, *[o[b if o.shape[0] > 1 else 0, r0:r1, x0:x1] for o in others])
+            if mask_tensor is not None:
+                res = _blend_with_mask(src, res, mask_tensor[b, r0:r1, x0:x1])
+            out.get(res)[b, r0:r1, x0:x1] = res
+
+    _run_units(range(B), frame, image.device)
+    if out.tensor is None:
+        if boxes is not None:
+            return _roi_output(image, _compute_dtype(image))  # mask is empty everywhere
+        return fn(image, *others)
+    return out.tensor
+
+
+def batch_chunk_size(image, work_factor=4.0, budget_mb=None):
+    """Frames per chunk so that ~`work_factor` frame-sized temporaries (compute dtype) fit the memory budget."""
+    B = int(image.shape[0])
+    budget_mb = CHUNK_BUDGET_MB if budget_mb is None else budget_mb
+    if budget_mb <= 0 and is_spilled(image):
+        budget_mb = SPILL_MB  # a spilled batch is never processed whole
+    if budget_mb <= 0 or B <= 1:
+        return max(1, B)
+    itemsize = torch.finfo(_compute_dtype(image)).bits // 8
+    frame_bytes = max(1, image[0].numel()) * itemsize * max(1.0, float(work_factor))
+    return int(max(1, min(B, (int(budget_mb) * 1024 * 1024) // frame_bytes)))
+
+
+def _empty_batch_like(res, B, H=None, W=None):
+    """
+    Uninitialized [B,H,W,C] output (H/W default to `res`'s) in `res`'s layout, so chunk and tile writes
+    stay plain copies (no transposition). Outputs above IMAGEOPS_SPILL_MB go to a spill file, always as
+    BHWC: a channels-first spill would have to be made contiguous again, on disk, when handed off.
+    """
+    _, h, w, C = res.shape
+    H = h if H is None else H
+    W = w if W is None else W
+    if _is_channels_first(res) and not should_spill(B * C * H * W * res.element_size(), res.device):
+        return torch.empty((B, C, H, W), dtype=res.dtype, device=res.device).permute(0, 2, 3, 1)
+    return empty_batch((B, H, W, C), res.dtype, res.device)
+
+
+def _run_tiled(fn, image, others, mask_tensor, halo, work_factor, tile):
+    """
+    run_batched for frames larger than `tile`: each [tile x tile] block is computed from its region
+    grown by `halo` (exact for ops whose support is within `halo`) and written into one preallocated
+    output. Temporaries scale with tile area; frames per step come from the same memory budget.
+    None when an input or the result does not line up with the image.
+    """
+    B, H, W = (int(v) for v in image.shape[:3])
+    if any(o.dim() != 4 or tuple(o.shape[1:3]) != (H, W) for o in others):
+        return None
+    chunk = batch_chunk_size(image[:, :tile + 2 * halo, :tile + 2 * halo], work_factor)
+    step = _parallel_step(chunk, B)
+    out = _Output(lambda res: _empty_batch_like(res, B, H, W))
+    mismatch = []
+
+    def tile_unit(unit):
+        y0, x0, s = unit
+        y1, x1, e = min(H, y0 + tile), min(W, x0 + tile), min(B, s + step)
+        gy0, gy1, gx0, gx1 = _grow((y0, y1, x0, x1), halo, H, W)
+        if mismatch:
+            return
+        res = fn(image[s:e, gy0:gy1, gx0:gx1],
+                 *[(o[s:e] if o.shape[0] == B else o)[:, gy0:gy1, gx0:gx1] for o in others])
+        if tuple(res.shape[1:3]) != (gy1 - gy0, gx1 - gx0):
+            mismatch.append(unit)  # op changes geometry: not tileable
+            return
+        res = res[:, y0 - gy0:y1 - gy0, x0 - gx0:x1 - gx0]
+        if mask_tensor is not None:
+            res = _blend_with_mask(image[s:e, y0:y1, x0:x1], res, mask_tensor[s:e, y0:y1, x0:x1])
+        out.get(res)[s:e, y0:y1, x0:x1] = res
+
+    units = [(y0, x0, s) for y0 in range(0, H, tile) for x0 in range(0, W, tile) for s in range(0, B, step)]
+    _run_units(units, tile_unit, image.device)
+    return None if mismatch else out.tensor
+
+
+def _run_roi(fn, image, others, mask_tensor, chunk, halo):
+    """
+    Masked run_batched restricted to each chunk's mask bounding box grown by `halo`. Pixels outside the
+    box keep their blend weight of 0, so the result equals the full-frame path. None when not worth it.
+    """
+    B, H, W = (int(v) for v in image.shape[:3])
+    if any(o.dim() != 4 or tuple(o.shape[1:3]) != (H, W) for o in others):
+        return None
+    boxes = [(s, min(B, s + chunk), _mask_bbox(mask_tensor[s:s + chunk])) for s in range(0, B, chunk)]
+    work = sum(_box_area(box and _grow(box, halo, H, W), e - s) for s, e, box in boxes)
+    if work > _ROI_MAX_COVERAGE * B * H * W:
+        return None
+
+    out = None
+    for s, e, box in boxes:
+        if box is None:
+            continue
+        y0, y1, x0, x1 = box
+        gy0, gy1, gx0, gx1 = _grow(box, halo, H, W)
+        res = fn(image[s:e, gy0:gy1, gx0:gx1],
+                 *[(o[s:e] if o.shape[0] == B else o)[:, gy0:gy1, gx0:gx1] for o in others])
+        if tuple(res.shape[1:]) != (gy1 - gy0, gx1 - gx0, image.shape[-1]):
+            return None  # op changes geometry or channels: not composable
+        src = image[s:e, y0:y1, x0:x1]
+        res = _blend_with_mask(src, res[:, y0 - gy0:y1 - gy0, x0 - gx0:x1 - gx0], mask_tensor[s:e, y0:y1, x0:x1])
+        if out is None:
+            out = _roi_output(image, res.dtype)
+        out[s:e, y0:y1, x0:x1] = res
+    if out is None:
+        return _roi_output(image, _compute_dtype(image))  # mask is empty everywhere
+    return out
+
+
+def crops_frames(image, mask=None):
+    """
+    True when run_batched(..., halo=...) may run the op on parts of a frame (mask ROI or tiles). Ops whose
+    rounding depends on the region size (FFT convolution) then take a region-independent path, so the
+    result does not depend on how frames were split.
+    """
+    return (mask is not None and MASK_ROI) or 0 < TILE_SIZE < max(int(image.shape[1]), int(image.shape[2]))
+
+
+def run_batched(fn, image, *others, mask=None, work_factor=4.0, halo=None):
+    """
+    Run `fn(x, *others)` over batch chunks sized from IMAGEOPS_CHUNK_BUDGET_MB.
+
+    Chunk results (mask-blended) are written into one preallocated output, so peak memory is
+    one output plus one chunk's temporaries regardless of batch length. Others whose batch
+    matches the image are sliced alongside it; anything else is passed through unchanged.
+
+    `halo` declares the op spatially local: each output pixel depends on inputs at most `halo`
+    pixels away (0 = pointwise). With a sparse mask (IMAGEOPS_MASK_ROI), the op then only runs
+    on the mask's bounding box plus halo and is composited into a copy of the source; frames
+    larger than IMAGEOPS_TILE_SIZE are processed tile by tile with `halo` pixels of overlap.
+    With IMAGEOPS_CPU_WORKERS > 1, chunks (and tiles) of CPU batches run concurrently.
+    """
+    B = int(image.shape[0])
+    chunk = batch_chunk_size(image, work_factor)
+    mask_tensor = None
+    if mask is not None:
+        mask_tensor = _prepare_mask_tensor(mask, B, image.shape[1], image.shape[2], image.device, image.dtype)
+        if halo is not None and MASK_ROI:
+            out = _run_roi(fn, image, others, mask_tensor, chunk, int(halo))
+            if out is not None:
+                return out
+    if halo is not None and 0 < TILE_SIZE < max(int(image.shape[1]), int(image.shape[2])):
+        out = _run_tiled(fn, image, others, mask_tensor, int(halo), work_factor, TILE_SIZE)
+        if out is not None:
+            return out
+
+    step = _parallel_step(chunk, B)
+    if step >= B:
+        res = fn(image, *others)
+        return res if mask_tensor is None else _blend_with_mask(image, res, mask_tensor)
+    out = _Output(lambda res: _empty_batch_like(res, B))
+
+    def frames(s):
+        e = min(B, s + step)
+        src = image[s:e]
+        res = fn(src, *[o[s:e] if o.shape[0] == B else o for o in others])
+        if mask_tensor is not None:
+            res = _blend_with_mask(src, res, mask_tensor[s:e])
+        out.get(res)[s:e] = res
+
+    _run_units(range(0, B, step), frames, image.device)
+    return out.tensor
@@ -1,11 +1,17 @@
+import hashlib
 import math
 import logging
 import os
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import torch
 from PIL import Image
 
+from ._env import _get_int_env
 from ._ops_constants import EPSILON, GAMMA_MAX, GAMMA_SAFE_MIN, LUMA_WEIGHTS
 
 # Constants shared across ImageOps nodes
@@ -14,28 +20,80 @@ logger = logging.getLogger(__name__)
 MAX_IMAGE_DIMENSION = 16384
 MAX_SCALE_DIMENSION = 8192
 
-def _get_int_env(name: str, default: int) -> int:
-    try:
-        return int(os.getenv(name, str(default)))
-    except (TypeError, ValueError):
-        return int(default)
-
 LARGE_IMAGE_WARN_MB = _get_int_env("IMAGEOPS_LARGE_IMAGE_WARN_MB", 2048)
+FUSED_POINTWISE = bool(_get_int_env("IMAGEOPS_FUSED_POINTWISE", 0))
+CHUNK_BUDGET_MB = _get_int_env("IMAGEOPS_CHUNK_BUDGET_MB", 2048)
+BLUR_FFT_MIN_RADIUS = _get_int_env("IMAGEOPS_BLUR_FFT_RADIUS", 12)
+MASK_CACHE_SIZE = _get_int_env("IMAGEOPS_MASK_CACHE_SIZE", 8)
+MASK_ROI = bool(_get_int_env("IMAGEOPS_MASK_ROI", 1))
+TILE_SIZE = _get_int_env("IMAGEOPS_TILE_SIZE", 4096)
+CPU_WORKERS = _get_int_env("IMAGEOPS_CPU_WORKERS", 1)
+# fp32 (default) | keep (incoming float dtype) | fp16 | bf16
+PRECISION = os.getenv("IMAGEOPS_PRECISION", "fp32").strip().lower()
 
 ALLOWED_EXTENSIONS = {
     '.png', '.jpg', '.jpeg', '.webp', '.bmp', '.gif', '.tif', '.tiff'
 }
 
 
-def _pil_to_tensor(img: Image.Image) -> torch.Tensor:
-    if img.mode not in ("RGB", "RGBA"):
-        bands = img.getbands() if hasattr(img, 'getbands') and img.getbands() else []
-        has_alpha = "A" in bands or img.mode in ("RGBA", "LA", "PA")
-        img = img.convert("RGBA" if has_alpha else "RGB")
+_PRECISION_DTYPES = {"fp16": torch.float16, "bf16": torch.bfloat16}
+
+
+def _compute_dtype(image: torch.Tensor) -> torch.dtype:
+    forced = _PRECISION_DTYPES.get(PRECISION)
+    if forced is not None:
+        return forced
+    if PRECISION == "keep" and image.is_floating_point():
+        return image.dtype
+    return torch.float32
+
+
+def _to_compute(image: torch.Tensor) -> torch.Tensor:
+    return image.to(_compute_dtype(image))
+
+
+def _to_nchw(image: torch.Tensor) -> torch.Tensor:
+    """[B,H,W,C] -> contiguous [B,C,H,W]. Free for a channels-first resident image (see `_from_nchw`)."""
+    return image.permute(0, 3, 1, 2).contiguous()
+
+
+def _from_nchw(x: torch.Tensor) -> torch.Tensor:
+    """
+    [B,C,H,W] -> [B,H,W,C] view of the same storage ("channels-first resident"): a valid IMAGE shape with
+    channel-planar strides, so the next spatial op's `_to_nchw` does not copy. Nodes make it contiguous
+    before handing it to non-ImageOps consumers (`_layout.hand_off`).
+    """
+    return x.permute(0, 2, 3, 1)
+
+
+def _is_channels_first(t: torch.Tensor) -> bool:
+    return t.dim() == 4 and not t.is_contiguous() and t.permute(0, 3, 1, 2).is_contiguous()
 
-    arr = np.array(img).astype(np.float32) / 255.0
+
+def _pil_has_alpha(img: Image.Image) -> bool:
+    bands = img.getbands() if hasattr(img, 'getbands') and img.getbands() else []
+    return "A" in bands or img.mode in ("RGBA", "LA", "PA")
+
+
+def _pil_to_uint8(img: Image.Image, channels=None) -> np.ndarray:
+    """
+    [H,W,3|4] uint8 array of `img`: RGB/RGBA as is, other modes converted (RGBA when they carry alpha).
+    `channels` forces 3 or 4 (e.g. to match the first frame of a sequence).
+    """
+    if channels is not None:
+        mode = "RGBA" if int(channels) == 4 else "RGB"
+        if img.mode != mode:
+            img = img.convert(mode)
+    elif img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if _pil_has_alpha(img) else "RGB")
+    arr = np.array(img)
     if arr.ndim == 2:
         arr = np.stack([arr, arr, arr], axis=-1)
+    return arr
+
+
+def _pil_to_tensor(img: Image.Image) -> torch.Tensor:
+    arr = _pil_to_uint8(img).astype(np.float32) / 255.0
     return torch.from_numpy(arr).unsqueeze(0)
 
 
@@ -52,11 +110,12 @@ def _tensor_to_pil(image: torch.Tensor) -> Image.Image:
 
 
 def _apply_color_correct(image, brightness, contrast, gamma, saturation):
-    x = image.float()
+    x = _to_compute(image)
     x = x + brightness
     x = (x - 0.5) * contrast + 0.5
     gamma = max(GAMMA_SAFE_MIN, min(GAMMA_MAX, float(gamma)))
-    x = torch.clamp(x, 0, 1) ** (1.0 / gamma)
+    # pow in fp32: half precision loses the shadows
+    x = (torch.clamp(x, 0, 1).float() ** (1.0 / gamma)).to(x.dtype)
 
     rgb = x[..., :3]
     lr, lg, lb = LUMA_WEIGHTS
@@ -80,24 +139,82 @@ def _gaussian_kernel1d(radius, sigma):
     return k / torch.sum(k)
 
 
-def _apply_blur(image, radius, sigma):
-    k = _gaussian_kernel1d(radius, sigma).to(image.device)
+_KERNEL_CACHE = OrderedDict()
+_KERNEL_CACHE_SIZE = 32
+# run_batched workers (IMAGEOPS_CPU_WORKERS) look kernels up concurrently; OrderedDict reordering is not atomic.
+_KERNEL_LOCK = threading.Lock()
+
+
+def _cached_gaussian_kernel1d(radius, sigma, device):
+    key = (int(max(0, radius)), float(max(EPSILON, sigma)), str(device))
+    with _KERNEL_LOCK:
+        k = _KERNEL_CACHE.get(key)
+        if k is None:
+            k = _gaussian_kernel1d(radius, sigma).to(device)
+            _KERNEL_CACHE[key] = k
+            while len(_KERNEL_CACHE) > _KERNEL_CACHE_SIZE:
+                _KERNEL_CACHE.popitem(last=False)
+        else:
+            _KERNEL_CACHE.move_to_end(key)
+        return k
+
+
+def _fft_length(n):
+    # Smallest 2^a*3^b*5^c >= n (fast sizes for pocketfft/cuFFT).
+    n = int(n)
+    while True:
+        m = n
+        for p in (2, 3, 5):
+            while m % p == 0:
+                m //= p
+        if m == 1:
+            return n
+        n += 1
+
+
+def _fft_conv_axis(x, k, radius, dim):
+    # x is already reflect-padded by `radius` along `dim`; returns the valid part.
+    length = x.shape[dim]
+    n = _fft_length(length + 2 * radius)
+    shape = [1] * x.dim()
+    shape[dim] = -1
+    spec = torch.fft.rfft(x, n=n, dim=dim) * torch.fft.rfft(k, n=n).view(shape)
+    return torch.fft.irfft(spec, n=n, dim=dim).narrow(dim, 2 * radius, length - 2 * radius)
+
+
+def _apply_blur(image, radius, sigma, fft=True):
+    """Separable Gaussian blur; `fft=False` keeps the direct convolution at any radius (exact on crops)."""
+    k = _cached_gaussian_kernel1d(radius, sigma, image.device)
     if k.numel() == 1:
         return image
 
-    x = image.permute(0, 3, 1, 2).contiguous()
+    dtype = _compute_dtype(image)
+    x = _to_nchw(image.to(dtype))
     _, C, _, _ = x.shape
+    pad = int(radius)
 
+    if fft and pad >= BLUR_FFT_MIN_RADIUS > 0:
+        # Large kernels: FFT convolution, cost ~independent of radius (matches direct conv to ~1e-6).
+        # torch.fft has no half-precision CPU kernels, so spectra are always fp32.
+        x = torch.nn.functional.pad(x.float(), (pad, pad, 0, 0), mode="reflect")
+        x = _fft_conv_axis(x, k, pad, -1)
+        x = torch.nn.functional.pad(x, (0, 0, pad, pad), mode="reflect")
+        x = _fft_conv_axis(x, k, pad, -2).to(dtype)
+        return _from_nchw(x.clamp_(0, 1))
+
+    # CPU fp16 depthwise conv stalls on wide kernels (K >= 17); run it in fp32 there.
+    conv_dtype = torch.float32 if (x.device.type == "cpu" and dtype == torch.float16) else dtype
+    x = x.to(conv_dtype)
+    k = k.to(conv_dtype)
     kx = k.view(1, 1, 1, -1).repeat(C, 1, 1, 1)
     ky = k.view(1, 1, -1, 1).repeat(C, 1, 1, 1)
 
-    pad = int(radius)
     x = torch.nn.functional.pad(x, (pad, pad, 0, 0), mode="reflect")
     x = torch.nn.functional.conv2d(x, kx, groups=C)
     x = torch.nn.functional.pad(x, (0, 0, pad, pad), mode="reflect")
     x = torch.nn.functional.conv2d(x, ky, groups=C)
 
-    return x.permute(0, 2, 3, 1).contiguous().clamp(0, 1)
+    return _from_nchw(x.to(dtype).clamp_(0, 1))
 
 
 def _select_media_tensor(image, video):
@@ -117,9 +234,36 @@ def _expand_mask_batch(mask: torch.Tensor, target_batch: int) -> torch.Tensor:
     return mask.repeat(reps, 1, 1)[:target_batch]
 
 
+_MASK_CACHE = OrderedDict()
+
+
 def _prepare_mask_tensor(mask, batch, height, width, device, dtype):
+    """
+    Mask -> [B,H,W] weights on device/dtype. Results for tensor masks are cached (LRU, MASK_CACHE_SIZE)
+    by mask identity + in-place version and target, so a MASK shared by several nodes is prepared once.
+    The returned tensor may be a shared broadcast view: treat it as read-only.
+    """
     if mask is None:
         return None
+    if not torch.is_tensor(mask) or MASK_CACHE_SIZE <= 0:
+        return _prepare_mask_tensor_uncached(mask, batch, height, width, device, dtype)
+
+    key = (id(mask), mask._version, mask.data_ptr(), tuple(mask.shape),
+           int(batch), int(height), int(width), str(device), dtype)
+    hit = _MASK_CACHE.get(key)
+    if hit is not None and hit[0]() is mask:
+        _MASK_CACHE.move_to_end(key)
+        return hit[1]
+
+    m = _prepare_mask_tensor_uncached(mask, batch, height, width, device, dtype)
+    if m is not None:
+        _MASK_CACHE[key] = (weakref.ref(mask, lambda _ref, k=key: _MASK_CACHE.pop(k, None)), m)
+        while len(_MASK_CACHE) > MASK_CACHE_SIZE:
+            _MASK_CACHE.popitem(last=False)
+    return m
+
+
+def _prepare_mask_tensor_uncached(mask, batch, height, width, device, dtype):
     m = mask
     if not torch.is_tensor(m):
         try:
@@ -146,7 +290,7 @@ def _prepare_mask_tensor(mask, batch, height, width, device, dtype):
     if m.shape[0] == 0:
         return None
 
-    m = _expand_mask_batch(m, batch)
+    # Resize/clamp the distinct mask frames first; a single-frame mask then expands as a view.
     if m.shape[1] != height or m.shape[2] != width:
         m = torch.nn.functional.interpolate(
             m.unsqueeze(1),
@@ -155,7 +299,8 @@ def _prepare_mask_tensor(mask, batch, height, width, device, dtype):
             align_corners=False,
         ).squeeze(1)
 
-    return torch.clamp(m.to(dtype=dtype), 0.0, 1.0)
+    m = torch.clamp(m.to(dtype=dtype), 0.0, 1.0)
+    return _expand_mask_batch(m, batch)
 
 
 def _apply_mask_to_image(original, processed, mask):
@@ -169,7 +314,10 @@ def _apply_mask_to_image(original, processed, mask):
     )
     if mask_tensor is None:
         return processed
+    return _blend_with_mask(original, processed, mask_tensor)
 
+
+def _blend_with_mask(original, processed, mask_tensor):
     weight = mask_tensor.unsqueeze(-1)
     return original * (1.0 - weight) + processed * weight
 
@@ -178,14 +326,14 @@ def _apply_mask_to_image(original, processed, mask):
 # =========================
 
 def _apply_levels(image: torch.Tensor, in_min: float, in_max: float, gamma: float, out_min: float, out_max: float):
-    x = image.float()
+    x = _to_compute(image)
     in_min = float(in_min); in_max = float(in_max)
     out_min = float(out_min); out_max = float(out_max)
     denom = max(EPSILON, (in_max - in_min))
     y = (x - in_min) / denom
     y = y.clamp(0.0, 1.0)
     g = float(max(GAMMA_SAFE_MIN, min(GAMMA_MAX, gamma)))
-    y = y ** (1.0 / g)
+    y = (y.float() ** (1.0 / g)).to(x.dtype)
     y = out_min + y * (out_max - out_min)
     return y.clamp(0.0, 1.0)
 
@@ -223,13 +371,14 @@ def _hsv_to_rgb(hsv: torch.Tensor):
     return torch.stack([r, g, b], dim=-1)
 
 def _apply_huesat(image: torch.Tensor, hue_deg: float, saturation: float, value: float):
-    x = image.float()
-    rgb = x[..., :3].clamp(0,1)
+    x = _to_compute(image)
+    # HSV round trip in fp32 (hue sector selection is precision-sensitive)
+    rgb = x[..., :3].float().clamp(0,1)
     hsv = _rgb_to_hsv(rgb)
     hue = (hsv[...,0] + (float(hue_deg) / 360.0)) % 1.0
     sat = (hsv[...,1] * float(saturation)).clamp(0.0, 4.0)
     val = (hsv[...,2] * float(value)).clamp(0.0, 4.0)
-    rgb2 = _hsv_to_rgb(torch.stack([hue, sat, val], dim=-1)).clamp(0,1)
+    rgb2 = _hsv_to_rgb(torch.stack([hue, sat, val], dim=-1)).clamp(0,1).to(x.dtype)
     if x.shape[-1] == 4:
         x = torch.cat([rgb2, x[...,3:4]], dim=-1)
     else:
@@ -237,7 +386,7 @@ def _apply_huesat(image: torch.Tensor, hue_deg: float, saturation: float, value:
     return x.clamp(0,1)
 
 def _apply_invert(image: torch.Tensor, invert_alpha: bool = False):
-    x = image.float()
+    x = _to_compute(image)
     if x.shape[-1] == 4:
         rgb = 1.0 - x[..., :3]
         a = (1.0 - x[..., 3:4]) if invert_alpha else x[..., 3:4]
@@ -245,10 +394,10 @@ def _apply_invert(image: torch.Tensor, invert_alpha: bool = False):
     return (1.0 - x).clamp(0,1)
 
 def _apply_clamp(image: torch.Tensor, min_v: float, max_v: float):
-    return image.float().clamp(float(min_v), float(max_v)).clamp(0,1)
+    return _to_compute(image).clamp(float(min_v), float(max_v)).clamp(0,1)
 
 def _apply_sharpen(image: torch.Tensor, amount: float, radius: int, sigma: float, threshold: float):
-    x = image.float().clamp(0,1)
+    x = _to_compute(image).clamp(0,1)
     if float(amount) == 0.0 or int(radius) <= 0:
         return x
     blurred = _apply_blur(x, int(radius), float(max(EPSILON, sigma)))
@@ -261,14 +410,14 @@ def _apply_sharpen(image: torch.Tensor, amount: float, radius: int, sigma: float
 
 def _apply_edge_detect(image: torch.Tensor, strength: float):
     """Sobel edge magnitude on luma. Output is grayscale RGB (alpha passthrough)."""
-    x = image.float().clamp(0, 1)
+    x = _to_compute(image).clamp(0, 1)
     rgb = x[..., :3]
     lr, lg, lb = LUMA_WEIGHTS
     l = (lr * rgb[..., 0] + lg * rgb[..., 1] + lb * rgb[..., 2]).clamp(0, 1)  # [B,H,W]
     l = l.unsqueeze(1)  # [B,1,H,W]
 
-    kx = torch.tensor([[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]], dtype=torch.float32, device=x.device).view(1, 1, 3, 3)
-    ky = torch.tensor([[-1, -2, -1], [0, 0, 0], [1, 2, 1]], dtype=torch.float32, device=x.device).view(1, 1, 3, 3)
+    kx = torch.tensor([[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]], dtype=x.dtype, device=x.device).view(1, 1, 3, 3)
+    ky = torch.tensor([[-1, -2, -1], [0, 0, 0], [1, 2, 1]], dtype=x.dtype, device=x.device).view(1, 1, 3, 3)
 
     pad = torch.nn.functional.pad(l, (1, 1, 1, 1), mode="reflect")
     gx = torch.nn.functional.conv2d(pad, kx)
@@ -277,15 +426,15 @@ def _apply_edge_detect(image: torch.Tensor, strength: float):
     mag = torch.sqrt(gx * gx + gy * gy) * float(strength)
     mag = mag.clamp(0, 1)
 
-    out_rgb = mag.repeat(1, 3, 1, 1).permute(0, 2, 3, 1).contiguous()
+    planes = [mag.expand(-1, 3, -1, -1)]
     if x.shape[-1] == 4:
-        return torch.cat([out_rgb, x[..., 3:4]], dim=-1).clamp(0, 1)
-    return out_rgb.clamp(0, 1)
+        planes.append(x[..., 3:4].permute(0, 3, 1, 2).clamp(0, 1))
+    return _from_nchw(torch.cat(planes, dim=1))
 
 def _apply_merge(a: torch.Tensor, b: torch.Tensor, mode: str, mix: float):
     # a,b: [B,H,W,C]
-    a = a.float().clamp(0,1)
-    b = b.float().clamp(0,1)
+    a = _to_compute(a).clamp(0,1)
+    b = b.to(a.dtype).clamp(0,1)
     mode = str(mode).lower()
     m = float(mix)
     ar, br = a[..., :3], b[..., :3]
@@ -346,7 +495,7 @@ def _dilate_erode_mask(mask: torch.Tensor, radius: int, op: str):
     return out[:,0,:,:].clamp(0,1)
 
 def _apply_glow(image: torch.Tensor, threshold: float, radius: int, sigma: float, intensity: float):
-    x = image.float().clamp(0,1)
+    x = _to_compute(image).clamp(0,1)
     rgb = x[..., :3]
     lr, lg, lb = LUMA_WEIGHTS
     luma = (lr*rgb[...,0] + lg*rgb[...,1] + lb*rgb[...,2]).unsqueeze(-1)
@@ -369,29 +518,132 @@ def _crop_pad(image: torch.Tensor, x: int, y: int, w: int, h: int, pad: int, pad
     left = max(0, -x0); top = max(0, -y0); right = max(0, x1 - W); bottom = max(0, y1 - H)
     x0c = max(0, x0); y0c = max(0, y0); x1c = min(W, x1); y1c = min(H, y1)
     cropped = image[:, y0c:y1c, x0c:x1c, :]
+    if not (left or top or right or bottom or pad > 0):
+        return cropped
+    # Both pads run on one NCHW tensor: at most one layout copy in, none out (channels-first resident).
+    t = cropped.permute(0,3,1,2)
     if left or top or right or bottom:
-        t = cropped.permute(0,3,1,2).contiguous()
         mode = str(pad_mode).lower()
         if mode not in ("reflect","replicate","constant"):
             mode = "reflect"
-        if mode == "replicate":
-            mode = "replicate"
-        elif mode == "constant":
-            mode = "constant"
-        else:
-            mode = "reflect"
-        t = torch.nn.functional.pad(t, (left,right,top,bottom), mode=mode)
-        cropped = t.permute(0,2,3,1).contiguous()
+        t = torch.nn.functional.pad(t.contiguous(), (left,right,top,bottom), mode=mode)
     if pad>0:
-        t = cropped.permute(0,3,1,2).contiguous()
-        t = torch.nn.functional.pad(t, (pad,pad,pad,pad), mode="reflect")
-        cropped = t.permute(0,2,3,1).contiguous()
-    return cropped
+        t = torch.nn.functional.pad(t.contiguous(), (pad,pad,pad,pad), mode="reflect")
+    return _from_nchw(t)
 
 def _resize(image: torch.Tensor, out_w: int, out_h: int):
-    x = image.permute(0,3,1,2).contiguous()
+    x = _to_nchw(image)
     x = torch.nn.functional.interpolate(x, size=(int(out_h), int(out_w)), mode="bilinear", align_corners=False)
-    return x.permute(0,2,3,1).contiguous().clamp(0,1)
+    return _from_nchw(x.clamp_(0,1))
+
+def _transform_geometry(width: int, height: int, translate_x: int, translate_y: int, rotate_deg: float,
+                        scale: float, expand: bool):
+    """
+    Combined scale -> rotate -> translate mapping (PIL resize/rotate/paste semantics).
+    Returns (out_w, out_h, A, b): source = A @ output + b, in continuous pixel coordinates.
+    """
+    sw, sh = int(width), int(height)
+    if abs(scale - 1.0) > EPSILON:
+        sw, sh = max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+        if sw > MAX_SCALE_DIMENSION or sh > MAX_SCALE_DIMENSION:
+            logger.error(f"Scaled dimensions ({sw}x{sh}) exceed maximum ({MAX_SCALE_DIMENSION}x{MAX_SCALE_DIMENSION})")
+            raise ValueError(
+                f"Resulting image size ({sw}x{sh}) would exceed maximum allowed dimensions "
+                f"({MAX_SCALE_DIMENSION}x{MAX_SCALE_DIMENSION}). "
+                f"Original: {width}x{height}, Scale: {scale:.2f}"
+            )
+
+    # Rotation about the scaled image center, same matrix (and expand bbox) as PIL.Image.rotate.
+    a, b, c, d, e, f = 1.0, 0.0, 0.0, 0.0, 1.0, 0.0
+    ow, oh = sw, sh
+    if abs(rotate_deg) > EPSILON:
+        ang = -math.radians(float(rotate_deg))
+        a, b = round(math.cos(ang), 15), round(math.sin(ang), 15)
+        d, e = -b, a
+        cx, cy = sw / 2.0, sh / 2.0
+        c = a * -cx + b * -cy + cx
+        f = d * -cx + e * -cy + cy
+        if expand:
+            xs, ys = [], []
+            for px, py in ((0, 0), (sw, 0), (sw, sh), (0, sh)):
+                xs.append(a * px + b * py + c)
+                ys.append(d * px + e * py + f)
+            ow = math.ceil(max(xs)) - math.floor(min(xs))
+            oh = math.ceil(max(ys)) - math.floor(min(ys))
+            c, f = a * -(ow - sw) / 2.0 + b * -(oh - sh) / 2.0 + c, d * -(ow - sw) / 2.0 + e * -(oh - sh) / 2.0 + f
+            if ow > MAX_SCALE_DIMENSION or oh > MAX_SCALE_DIMENSION:
+                logger.error(f"Rotated dimensions with expand ({ow}x{oh}) exceed maximum")
+                raise ValueError(f"Rotated image size ({ow}x{oh}) exceeds maximum ({MAX_SCALE_DIMENSION}x{MAX_SCALE_DIMENSION})")
+
+    # translate: u = x - t ; rotate: v = M u + m ; scale: s = D v
+    tx, ty = float(translate_x), float(translate_y)
+    dx, dy = width / float(sw), height / float(sh)
+    A = ((dx * a, dx * b), (dy * d, dy * e))
+    bias = (dx * (c - a * tx - b * ty), dy * (f - d * tx - e * ty))
+    return ow, oh, A, bias
+
+
+def _apply_transform(image: torch.Tensor, translate_x: int, translate_y: int, rotate_deg: float, scale: float,
+                     filter: str = "bilinear", expand: bool = False):
+    """Scale/rotate/translate the whole [B,H,W,C] batch with a single resampling pass on its device."""
+    B, H, W, C = image.shape
+    ow, oh, A, bias = _transform_geometry(W, H, int(translate_x), int(translate_y), float(rotate_deg), float(scale),
+                                          bool(expand))
+
+    estimated_mb = (B * ow * oh * C * 4) / (1024 * 1024)
+    if estimated_mb > float(LARGE_IMAGE_WARN_MB):
+        logger.warning(f"Large image allocation: {B}x{ow}x{oh}x{C} (~{estimated_mb:.1f} MB) > {LARGE_IMAGE_WARN_MB} MB")
+
+    x = _to_compute(image)
+    dtype = x.dtype
+    mode = {"nearest": "nearest", "bicubic": "bicubic"}.get(str(filter).lower(), "bilinear")
+    if float(scale) < 1.0 - EPSILON and mode != "nearest":
+        # Minification: a grid_sample tap skips source pixels and aliases. Downscale first with an antialiased
+        # resize (filter support widened by 1/scale, as PIL's resize), then rotate/translate at 1:1.
+        sw, sh = max(1, int(round(W * float(scale)))), max(1, int(round(H * float(scale))))
+        t = torch.nn.functional.interpolate(x.permute(0, 3, 1, 2).float(), size=(sh, sw), mode=mode,
+                                            align_corners=False, antialias=True)
+        x = _from_nchw(t.clamp_(0, 1))
+        W, H, scale = sw, sh, 1.0
+        ow, oh, A, bias = _transform_geometry(W, H, int(translate_x), int(translate_y), float(rotate_deg), scale,
+                                              bool(expand))
+
+    rotated = abs(float(rotate_deg)) > EPSILON
+    scaled = (ow, oh) != (W, H) or abs(float(scale) - 1.0) > EPSILON
+    if not rotated and not scaled:
+        tx, ty = int(translate_x), int(translate_y)
+        if tx == 0 and ty == 0:
+            return x.to(dtype)
+        # Integer shift: plain copy into a blank canvas (exact, no resampling).
+        out = torch.zeros_like(x, dtype=dtype)
+        if abs(tx) < W and abs(ty) < H:
+            out[:, max(0, ty):H + min(0, ty), max(0, tx):W + min(0, tx), :] = \
+                x[:, max(0, -ty):H - max(0, ty), max(0, -tx):W - max(0, tx), :]
+        return out
+
+    # Map output normalized coords -> source normalized coords (align_corners=False).
+    (a00, a01), (a10, a11) = A
+    hw, hh = ow / 2.0, oh / 2.0
+    theta = torch.tensor(
+        [[
+            [a00 * hw * 2.0 / W, a01 * hh * 2.0 / W, ((a00 * hw + a01 * hh + bias[0]) * 2.0 / W) - 1.0],
+            [a10 * hw * 2.0 / H, a11 * hh * 2.0 / H, ((a10 * hw + a11 * hh + bias[1]) * 2.0 / H) - 1.0],
+        ]],
+        dtype=torch.float32,
+        device=x.device,
+    )
+    grid = torch.nn.functional.affine_grid(theta, size=(1, C, oh, ow), align_corners=False)
+    # Sampling stays fp32: half-precision grid coordinates drift by whole pixels on large frames.
+    t = x.permute(0, 3, 1, 2).float()
+    # Edge-clamped sampling (like PIL resize) with a hard coverage cut (like PIL rotate/paste fill).
+    out = torch.nn.functional.grid_sample(
+        t, grid.expand(B, -1, -1, -1), mode=mode, padding_mode="border", align_corners=False
+    )
+    inside = (grid.abs() <= 1.0).all(dim=-1)
+    if not bool(inside.all()):
+        out.mul_(inside.unsqueeze(1).to(out.dtype))
+    return _from_nchw(out.clamp_(0, 1).to(dtype))
+
 
 def _apply_crop_reformat(image: torch.Tensor, x: int, y: int, crop_w: int, crop_h: int, pad: int, pad_mode: str,
                          out_w: int, out_h: int, mode: str):
@@ -413,10 +665,9 @@ def _apply_crop_reformat(image: torch.Tensor, x: int, y: int, crop_w: int, crop_
         pad_x = max(0, out_w - nw); pad_y = max(0, out_h - nh)
         left = pad_x//2; right = pad_x - left
         top = pad_y//2; bottom = pad_y - top
-        t = xr.permute(0,3,1,2).contiguous()
+        t = _to_nchw(xr)
         t = torch.nn.functional.pad(t, (left,right,top,bottom), mode="constant", value=0.0)
-        out = t.permute(0,2,3,1).contiguous()
-        return out[:, :out_h, :out_w, :].clamp(0,1)
+        return _from_nchw(t[:, :, :out_h, :out_w])
     else:
         # crop center to out size
         y0c = max(0, (nh - out_h)//2)
@@ -424,7 +675,7 @@ def _apply_crop_reformat(image: torch.Tensor, x: int, y: int, crop_w: int, crop_
         return xr[:, y0c:y0c+out_h, x0c:x0c+out_w, :].clamp(0,1)
 
 def _apply_lumakey(image: torch.Tensor, low: float, high: float, softness: float):
-    x = image.float().clamp(0,1)
+    x = _to_compute(image).clamp(0,1)
     rgb = x[..., :3]
     lr, lg, lb = LUMA_WEIGHTS
     luma = (lr*rgb[...,0] + lg*rgb[...,1] + lb*rgb[...,2]).clamp(0,1)
@@ -446,14 +697,71 @@ def _apply_lumakey(image: torch.Tensor, low: float, high: float, softness: float
     mask = (m_low * m_high).clamp(0,1)
     return mask
 
-def _tensor_batch_to_pil_list(images: torch.Tensor):
+_QUANTIZE_CHUNK_ELEMS = 1 << 22
+
+
+def _tensor_batch_to_uint8(images: torch.Tensor, pin_memory=None) -> np.ndarray:
+    """
+    Quantize a [B,H,W,C] batch to uint8 on its own device, then move it to host in one transfer.
+    Same rounding as `_tensor_to_pil`. Returns a [B,H,W,C] uint8 array; `arr[i]` are zero-copy frame views.
+    """
     if images is None:
         raise ValueError("images is None")
     if images.dim() != 4:
         raise ValueError(f"Expected [B,H,W,C], got {tuple(images.shape)}")
-    out = []
-    b = int(images.shape[0])
-    for i in range(b):
-        t = images[i:i+1, ...]
-        out.append(_tensor_to_pil(t))
-    return out
+    src = images.detach()
+    B = int(src.shape[0])
+    # Quantize in slabs so the float temporaries stay bounded on long batches.
+    step = max(1, _QUANTIZE_CHUNK_ELEMS // max(1, src[0].numel()))
+    if src.device.type == "cpu":
+        out = np.empty(tuple(src.shape), dtype=np.uint8)
+        for s in range(0, B, step):
+            out[s:s + step] = torch.clamp(src[s:s + step].float(), 0, 1).mul_(255.0).add_(0.5).numpy()
+        return out
+
+    q = torch.empty(src.shape, dtype=torch.uint8, device=src.device)
+    for s in range(0, B, step):
+        q[s:s + step] = torch.clamp(src[s:s + step].float(), 0, 1).mul_(255.0).add_(0.5)
+    if pin_memory is None:
+        pin_memory = q.device.type == "cuda"
+    host = torch.empty(q.shape, dtype=torch.uint8, pin_memory=bool(pin_memory))
+    host.copy_(q, non_blocking=bool(pin_memory))
+    if pin_memory:
+        torch.cuda.current_stream(q.device).synchronize()
+    return host.numpy()
+
+
+def _uint8_to_pil(arr: np.ndarray) -> Image.Image:
+    if arr.shape[-1] == 4:
+        return Image.fromarray(arr, mode="RGBA")
+    return Image.fromarray(arr[..., :3], mode="RGB")
+
+
+def _tensor_batch_to_pil_list(images: torch.Tensor):
+    arr = _tensor_batch_to_uint8(images)
+    return [_uint8_to_pil(arr[i]) for i in range(arr.shape[0])]
+
+
+def _frame_digest(frame: torch.Tensor) -> bytes:
+    t = frame.detach().contiguous().cpu()
+    if t.dtype == torch.bfloat16:  # no numpy equivalent; hash the raw bits
+        t = t.view(torch.int16)
+    return hashlib.sha256(t.numpy()).digest()
+
+
+def _tensor_fingerprint(images: torch.Tensor, *extra, workers: int = 1) -> str:
+    """
+    Content key for a [B,...] tensor: sha256 of every frame's raw bytes, combined with shape, dtype and `extra`.
+    Frames are hashed on up to `workers` threads (hashlib releases the GIL on large buffers).
+    """
+    h = hashlib.sha256(repr((tuple(images.shape), str(images.dtype), extra)).encode("utf-8"))
+    frames = [images[i] for i in range(int(images.shape[0]))]
+    workers = max(1, min(int(workers), len(frames)))
+    if workers == 1:
+        digests = [_frame_digest(f) for f in frames]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="imageops_hash") as pool:
+            digests = list(pool.map(_frame_digest, frames))
+    for d in digests:
+        h.update(d)
+    return h.hexdigest()[:20]
@@ -0,0 +1,58 @@
+from ._env import _get_int_env
+
+# Spatial nodes hand their results to adjacent ImageOps nodes channels-first (0 = always emit contiguous BHWC).
+RESIDENT_LAYOUT = bool(_get_int_env("IMAGEOPS_RESIDENT_LAYOUT", 1))
+
+# Nodes whose IMAGE input goes straight into NCHW ops (or is only read), so a channels-first view costs nothing.
+# Pointwise nodes walk rows of contiguous BHWC and are deliberately not listed.
+CHANNELS_FIRST_CONSUMERS = frozenset({"ImageOpsBlur", "ImageOpsTransform", "ImageOpsPreview"})
+
+# Hidden inputs a node declares to learn who consumes its output.
+HIDDEN_INPUTS = {"prompt": "PROMPT", "unique_id": "UNIQUE_ID"}
+
+# unique_id -> whether the node's last IS_CHANGED folded a channels-first hand-off into its cache signature.
+_SIGNED = {}
+
+
+def consumers(prompt, unique_id, slot=0):
+    """class_type of every prompt node linked to output `slot` of node `unique_id`."""
+    uid = str(unique_id)
+    out = []
+    for node in prompt.values():
+        if not isinstance(node, dict):
+            continue
+        for v in (node.get("inputs") or {}).values():
+            if isinstance(v, (list, tuple)) and len(v) == 2 and str(v[0]) == uid and v[1] == slot:
+                out.append(node.get("class_type"))
+    return out
+
+
+def keeps_channels_first(prompt, unique_id):
+    """True when the output only feeds nodes in CHANNELS_FIRST_CONSUMERS."""
+    if not RESIDENT_LAYOUT or not isinstance(prompt, dict) or unique_id is None:
+        return False
+    kinds = consumers(prompt, unique_id)
+    return bool(kinds) and all(k in CHANNELS_FIRST_CONSUMERS for k in kinds)
+
+
+def layout_signature(prompt, unique_id):
+    """
+    Layout term of a hand-off node's IS_CHANGED. ComfyUI serves a cached output to whatever consumes it
+    later, so a channels-first output is only safe when the consumer set is part of the cache signature:
+    the decision is recorded here and `hand_off` honours nothing else.
+    """
+    keep = keeps_channels_first(prompt, unique_id)
+    if unique_id is not None:
+        _SIGNED[str(unique_id)] = keep
+    return "channels_first" if keep else "bhwc"
+
+
+def hand_off(image, prompt=None, unique_id=None):
+    """
+    Node output in the layout its consumers want: a channels-first resident view stays as-is between
+    ImageOps spatial nodes whose IS_CHANGED signed that layout, anything else gets ComfyUI's contiguous
+    BHWC (a no-op when already contiguous).
+    """
+    if unique_id is not None and _SIGNED.get(str(unique_id)) and keeps_channels_first(prompt, unique_id):
+        return image
+    return image.contiguous()
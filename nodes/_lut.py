@@ -0,0 +1,87 @@
+from collections import OrderedDict
+
+import torch
+
+from ._helpers import _apply_color_correct, _apply_huesat, _compute_dtype, _get_int_env
+
+LUT_CACHE_SIZE = _get_int_env("IMAGEOPS_LUT_CACHE_SIZE", 16)
+# Samples of the baked alpha curve: 1D, so it can be far finer than the 3D lattice.
+ALPHA_CURVE_SIZE = 4096
+
+_LUT_CACHE = OrderedDict()
+
+
+def _cached(key, bake):
+    value = _LUT_CACHE.get(key)
+    if value is not None:
+        _LUT_CACHE.move_to_end(key)
+        return value
+    value = bake()
+    _LUT_CACHE[key] = value
+    while len(_LUT_CACHE) > max(0, LUT_CACHE_SIZE):
+        _LUT_CACHE.popitem(last=False)
+    return value
+
+
+def bake_color_lut(params, size, device):
+    """
+    Bake ColorAjust's 7 parameters into a [1,3,S,S,S] LUT (D=blue, H=green, W=red).
+    The lattice goes through the direct ops, so the LUT is exact at every node.
+    """
+    params = tuple(float(p) for p in params)
+    return _cached((params, int(size), str(device)), lambda: _bake_color_lut(params, int(size), device))
+
+
+def _bake_color_lut(params, size, device):
+    brightness, contrast, gamma, saturation, hue_deg, hs_saturation, hs_value = params
+    axis = torch.linspace(0.0, 1.0, int(size), dtype=torch.float32, device=device)
+    b, g, r = torch.meshgrid(axis, axis, axis, indexing="ij")
+    lattice = torch.stack([r, g, b], dim=-1)
+    y = _apply_color_correct(lattice, brightness, contrast, gamma, saturation)
+    y = _apply_huesat(y, hue_deg, hs_saturation, hs_value)
+    return y.float().permute(3, 0, 1, 2).unsqueeze(0).contiguous()
+
+
+def bake_alpha_curve(params, device):
+    """
+    ColorAjust's effect on alpha as a [ALPHA_CURVE_SIZE] curve. The direct ops apply brightness, contrast and
+    gamma to every channel (saturation and hue/sat only touch RGB); the samples go through those same ops.
+    """
+    params = tuple(float(p) for p in params)
+
+    def bake():
+        brightness, contrast, gamma, saturation, hue_deg, hs_saturation, hs_value = params
+        axis = torch.linspace(0.0, 1.0, ALPHA_CURVE_SIZE, dtype=torch.float32, device=device)
+        y = _apply_color_correct(axis.unsqueeze(-1).expand(-1, 4), brightness, contrast, gamma, saturation)
+        y = _apply_huesat(y, hue_deg, hs_saturation, hs_value)
+        return y[:, 3].float().contiguous()
+
+    return _cached(("alpha",) + params + (str(device),), bake)
+
+
+def _apply_curve(a, curve):
+    """Piecewise-linear lookup of values in 0..1 on a uniformly sampled curve."""
+    n = curve.numel() - 1
+    pos = a.clamp(0, 1) * n
+    i0 = pos.floor().clamp_(max=n - 1)
+    frac = pos - i0
+    lo = curve[i0.long()]
+    hi = curve[i0.long() + 1]
+    return lo + (hi - lo) * frac
+
+
+def apply_color_lut(image, lut, alpha=None):
+    """
+    Trilinear LUT lookup for [...,C] pixels. Alpha (if any) goes through the `alpha` curve
+    (`bake_alpha_curve`), as the direct ops transform it too; without a curve it passes through clamped.
+    """
+    dtype = _compute_dtype(image)
+    x = image.float()
+    lead = x.shape[:-1]
+    grid = (x[..., :3].clamp(0, 1) * 2.0 - 1.0).reshape(1, 1, 1, -1, 3)
+    y = torch.nn.functional.grid_sample(lut, grid, mode="bilinear", padding_mode="border", align_corners=True)
+    rgb = y.reshape(3, -1).t().reshape(*lead, 3)
+    if x.shape[-1] == 4:
+        a = x[..., 3:4] if alpha is None else _apply_curve(x[..., 3:4], alpha)
+        return torch.cat([rgb, a], dim=-1).clamp(0, 1).to(dtype)
+    return rgb.clamp(0, 1).to(dtype)
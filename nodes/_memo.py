@@ -0,0 +1,118 @@
+import hashlib
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+import torch
+
+from . import _helpers
+from ._helpers import _get_int_env, _tensor_fingerprint, logger
+from ._layout import HIDDEN_INPUTS, layout_signature
+from ._spill import is_spilled
+
+# Byte budget for memoized node results (0 = off: no fingerprinting, no caching). Opt-in: a miss pays a full
+# sha256 of every input, which costs more than the cheaper ops it would save.
+MEMO_BUDGET_MB = _get_int_env("IMAGEOPS_MEMO_MB", 0)
+_HASH_WORKERS = min(4, os.cpu_count() or 1)
+
+_FINGERPRINTS = {}
+_RESULTS = OrderedDict()
+_LOCK = threading.Lock()
+_RESULT_BYTES = 0
+
+
+def fingerprint(t):
+    """
+    Content fingerprint of a tensor, computed once per tensor object and in-place version (a tensor fed
+    to several nodes is hashed once). Entries go away with the tensor.
+    """
+    sig = (t._version, t.data_ptr(), tuple(t.shape), t.dtype, str(t.device))
+    hit = _FINGERPRINTS.get(id(t))
+    if hit is not None and hit[0] == sig:
+        return hit[1]
+    fp = _tensor_fingerprint(t, workers=_HASH_WORKERS)
+    if hit is None:
+        try:
+            weakref.finalize(t, _FINGERPRINTS.pop, id(t), None)
+        except TypeError:
+            return fp
+    _FINGERPRINTS[id(t)] = (sig, fp)
+    return fp
+
+
+def _value_key(v):
+    if is_spilled(v):
+        # Hashing would read the whole file back from disk; identify the buffer instead.
+        return ("spilled", v.untyped_storage().data_ptr(), v.storage_offset(), tuple(v.shape), v._version)
+    if isinstance(v, torch.Tensor):
+        return ("tensor", str(v.device), str(v.dtype), fingerprint(v))
+    if isinstance(v, (bool, int, float, str)) or v is None:
+        return v
+    return repr(v)
+
+
+def _nbytes(result):
+    if isinstance(result, torch.Tensor):
+        return result.numel() * result.element_size()
+    return None
+
+
+def _memoizable(t):
+    return not isinstance(t, torch.Tensor) or (t.device.type == "cpu" and not is_spilled(t))
+
+
+def memoized(op, params, compute, *tensors):
+    """
+    Return `compute()` for (`op`, `params`, tensor contents), reusing an earlier result when the same
+    inputs come back (e.g. a widget changed and changed back). LRU-evicted within IMAGEOPS_MEMO_MB.
+    Only CPU tensors are memoized: fingerprinting a device tensor means copying it all to the host, and
+    stored results would pin device memory outside the budget. Spilled batches are too large to hash or keep.
+    """
+    global _RESULT_BYTES
+    if MEMO_BUDGET_MB <= 0 or not all(_memoizable(t) for t in tensors):
+        return compute()
+    budget = MEMO_BUDGET_MB * 1024 * 1024
+    key = (op, _helpers.PRECISION, tuple(_value_key(p) for p in params), tuple(_value_key(t) for t in tensors))
+    with _LOCK:
+        hit = _RESULTS.get(key)
+        if hit is not None:
+            _RESULTS.move_to_end(key)
+            return hit
+
+    result = compute()
+    size = _nbytes(result)
+    if size is None or size > budget or not _memoizable(result):
+        return result
+    with _LOCK:
+        if key not in _RESULTS:
+            _RESULTS[key] = result
+            _RESULT_BYTES += size
+        while _RESULT_BYTES > budget and _RESULTS:
+            _, dropped = _RESULTS.popitem(last=False)
+            _RESULT_BYTES -= _nbytes(dropped)
+    return result
+
+
+def clear_memo():
+    global _RESULT_BYTES
+    with _LOCK:
+        _RESULTS.clear()
+        _RESULT_BYTES = 0
+    logger.debug("ImageOps memo cleared")
+
+
+def changed_signature(inputs):
+    """
+    IS_CHANGED value for a deterministic node: stable for equal inputs. Tensors ComfyUI hands over
+    (usually None for linked inputs at that point) contribute their content fingerprint.
+    """
+    h = hashlib.sha256()
+    for k in sorted(inputs):
+        if k in HIDDEN_INPUTS:
+            continue  # graph context, not node inputs
+        h.update(repr((k, _value_key(inputs[k]))).encode("utf-8"))
+    if "unique_id" in inputs:
+        # hand-off nodes: the output layout depends on the consumers, so it belongs in the signature
+        h.update(layout_signature(inputs.get("prompt"), inputs["unique_id"]).encode("utf-8"))
+    return h.hexdigest()
@@ -1,10 +1,35 @@
+import hashlib
+import io
 import os
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
 from PIL import Image
 
 import folder_paths
 
-from ._helpers import _tensor_batch_to_pil_list, logger
+from ._helpers import _get_int_env, _tensor_batch_to_uint8, _tensor_fingerprint, _uint8_to_pil, logger
+from ._preview_store import MEMORY_TYPE, STORE, memory_enabled
+from ._profiling import phase
+from ._spill import is_spilled
+
+PREVIEW_WORKERS = _get_int_env("IMAGEOPS_PREVIEW_WORKERS", min(4, os.cpu_count() or 1))
+# Longest edge for animated previews (0 = full resolution).
+ANIM_MAX_SIZE = _get_int_env("IMAGEOPS_ANIM_MAX_SIZE", 0)
+# Reuse preview files for identical (tensor, options) instead of re-encoding.
+PREVIEW_CACHE = bool(_get_int_env("IMAGEOPS_PREVIEW_CACHE", 1))
+# Size cap for ImageOps files in the temp dir (0 = unbounded); least recently written/reused go first.
+TEMP_QUOTA_MB = _get_int_env("IMAGEOPS_TEMP_QUOTA_MB", 1024)
+_TEMP_FILE_PREFIX = "imageops"
+
+# "fast" trades file size for encode time (previews are temp files anyway); "max" is for written sequences.
+COMPRESSION_PRESETS = {
+    "default": {"png_level": 6, "webp_method": 6, "jpeg_optimize": True, "tiff_compression": "tiff_lzw"},
+    "fast": {"png_level": 1, "webp_method": 0, "jpeg_optimize": False, "tiff_compression": "raw"},
+    "max": {"png_level": 9, "webp_method": 6, "jpeg_optimize": True, "tiff_compression": "tiff_adobe_deflate"},
+}
 
 
 def _ensure_dir(p: str):
@@ -12,118 +37,382 @@ def _ensure_dir(p: str):
     return p
 
 
-def save_temp_images(images, prefix="imageops", ext="png", quality=95):
+_PIL_FORMATS = {"png": "PNG", "jpg": "JPEG", "jpeg": "JPEG", "webp": "WEBP", "gif": "GIF"}
+
+
+def _entry(name):
+    return {"filename": name, "subfolder": "", "type": MEMORY_TYPE if memory_enabled() else "temp"}
+
+
+def preview_ui(items):
+    """Node `ui` dict for saver entries: temp files under "images", in-memory previews under their own key."""
+    items = [item for item in items if item]
+    if items and items[0]["type"] == MEMORY_TYPE:
+        return {MEMORY_TYPE: items}
+    return {"images": items}
+
+
+def preview_cache(images, *options):
+    """Options that key cached previews of `images` (a saver's `cache` argument), or None when caching is off."""
+    if not PREVIEW_CACHE or is_spilled(images):
+        return None
+    return options
+
+
+def preview_key(windows, *options):
+    """
+    Content key of a preview: sha256 over the uint8 frames exactly as a saver encodes them, given as
+    [n,H,W,C] arrays (a stream of bulk windows is hashed as it is produced, never held whole), plus `options`.
+    """
+    h = hashlib.sha256(repr(options).encode("utf-8"))
+    for arr in windows:
+        with phase("fingerprint"):
+            h.update(_tensor_fingerprint(torch.from_numpy(arr), workers=PREVIEW_WORKERS).encode("utf-8"))
+    return h.hexdigest()[:20]
+
+
+def _reuse(temp_dir, names):
+    """True if every file already exists; their mtimes are refreshed so eviction treats them as recent."""
+    if memory_enabled():
+        return STORE.touch(names)
+    try:
+        for name in names:
+            os.utime(os.path.join(temp_dir, name))
+    except OSError:
+        return False
+    return True
+
+
+def _atomic_save(out_path, ext, save):
+    """Run `save(path)` on a sibling temp name, then rename into place, so a cached name is never half-written."""
+    tmp = f"{out_path}.{uuid.uuid4().hex[:8]}.part.{ext}"
+    try:
+        save(tmp)
+        os.replace(tmp, out_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _write(out_path, ext, save):
+    """Store `save`'s output in the in-memory preview store when enabled, else atomically at `out_path`."""
+    if memory_enabled():
+        buf = io.BytesIO()
+        save(buf)
+        STORE.put(os.path.basename(out_path), buf.getvalue())
+    else:
+        _atomic_save(out_path, ext, save)
+
+
+def enforce_temp_quota(keep=(), quota_mb=None):
+    """
+    Delete the oldest (by mtime) ImageOps files in ComfyUI's temp dir until they fit IMAGEOPS_TEMP_QUOTA_MB.
+    Files named in `keep` (the current run's outputs) are never removed. Returns bytes freed.
+    """
+    quota_mb = TEMP_QUOTA_MB if quota_mb is None else int(quota_mb)
+    if quota_mb <= 0:
+        return 0
+    files = []
+    total = 0
+    try:
+        with os.scandir(folder_paths.get_temp_directory()) as it:
+            for entry in it:
+                if entry.name.startswith(_TEMP_FILE_PREFIX) and entry.is_file(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    files.append((st.st_mtime, st.st_size, entry.path, entry.name))
+                    total += st.st_size
+    except OSError as e:
+        logger.warning(f"ImageOps temp quota: cannot scan temp dir: {e}")
+        return 0
+
+    limit = quota_mb * 1024 * 1024
+    if total <= limit:
+        return 0
+    keep = set(keep)
+    freed = removed = 0
+    for _, size, path, name in sorted(files):
+        if total - freed <= limit:
+            break
+        if name in keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        freed += size
+        removed += 1
+    logger.info(f"ImageOps temp quota: evicted {removed} file(s), {freed / (1024 * 1024):.1f} MB")
+    return freed
+
+
+def _preset(compression):
+    return COMPRESSION_PRESETS.get(str(compression), COMPRESSION_PRESETS["default"])
+
+
+def _save_image(img, out_path, ext, quality, compression="default"):
+    preset = _preset(compression)
+    fmt = _PIL_FORMATS.get(ext.lower(), "PNG")  # explicit, so `out_path` may also be a buffer
+    if ext.lower() in ("jpg", "jpeg"):
+        img.convert("RGB").save(out_path, format=fmt, quality=int(quality), optimize=preset["jpeg_optimize"])
+    elif ext.lower() == "webp":
+        # WEBP can be used as static preview too
+        img.save(out_path, format=fmt, quality=int(quality), method=preset["webp_method"])
+    else:
+        img.save(out_path, format=fmt, compress_level=preset["png_level"])
+
+
+def save_temp_images(images, prefix="imageops", ext="png", quality=95, compression="default", cache=None):
     """
     Save a batch of IMAGE tensors to ComfyUI's temp directory and return UI dict entries.
+    Frames are encoded on a bounded thread pool (PIL releases the GIL while compressing);
+    entries come back in frame order. With `cache` options (see `preview_cache`) file names are
+    keyed by the converted uint8 batch, and existing files are returned without encoding anything.
     Returns: list[dict] -> {"filename","subfolder","type"}
     """
     temp_dir = _ensure_dir(folder_paths.get_temp_directory())
-    subfolder = ""  # temp is already a separate bucket in comfy
-    pil_list = _tensor_batch_to_pil_list(images)
+    count = int(images.shape[0])
+    with phase("convert"):
+        frames = _tensor_batch_to_uint8(images)
+    key = preview_key([frames], *cache) if cache is not None else None
+    run_id = key or uuid.uuid4().hex[:10]
+    names = [f"{prefix}_{run_id}_{idx:03d}.{ext}" for idx in range(count)]
+    if key and count and _reuse(temp_dir, names):
+        logger.info(f"ImageOps preview: reused {count} cached {ext} frame(s)")
+        return [_entry(name) for name in names]
 
-    ui_items = []
-    for idx, img in enumerate(pil_list):
-        name = f"{prefix}_{uuid.uuid4().hex[:10]}_{idx:03d}.{ext}"
-        out_path = os.path.join(temp_dir, name)
+    def encode(idx):
+        out_path = os.path.join(temp_dir, names[idx])
         try:
-            if ext.lower() in ("jpg", "jpeg"):
-                img.convert("RGB").save(out_path, quality=int(quality), optimize=True)
-            elif ext.lower() == "webp":
-                # WEBP can be used as static preview too
-                img.save(out_path, quality=int(quality), method=6)
-            else:
-                img.save(out_path)
+            _write(out_path, ext, lambda p: _save_image(_uint8_to_pil(frames[idx]), p, ext, quality, compression))
         except Exception as e:
             logger.error(f"Failed to save temp image '{out_path}': {e}")
-            continue
+            return None
+        return _entry(names[idx])
 
-        ui_items.append({"filename": name, "subfolder": subfolder, "type": "temp"})
-    return ui_items
+    t0 = time.perf_counter()
+    workers = max(1, min(PREVIEW_WORKERS, count))
+    with phase("encode"):
+        if workers == 1:
+            results = [encode(idx) for idx in range(count)]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="imageops_preview") as pool:
+                results = list(pool.map(encode, range(count)))
+    elapsed_ms = (time.perf_counter() - t0) * 1000.0
+    if count:
+        logger.info(
+            f"ImageOps preview: encoded {count} {ext} frame(s) in {elapsed_ms:.1f} ms "
+            f"({elapsed_ms / count:.1f} ms/frame, {workers} worker(s), {compression})"
+        )
+
+    return [item for item in results if item is not None]
+
+
+class _LazyFrames(Image.Image):
+    """
+    Multi-frame PIL image whose frames are produced on seek(), one at a time.
+    Lets the WEBP/GIF writers (which walk n_frames/seek) stream a batch without a full PIL list.
+    """
+
+    def __init__(self, get_frame, count):
+        super().__init__()
+        self._get_frame = get_frame
+        self.n_frames = int(count)
+        self.is_animated = self.n_frames > 1
+        self._frame_idx = -1
+        self.seek(0)
+
+    def seek(self, frame):
+        if not 0 <= frame < self.n_frames:
+            raise EOFError("end of sequence")
+        if frame == self._frame_idx:
+            return
+        img = self._get_frame(frame)
+        self.im = img.im
+        self._size = img.size
+        if isinstance(getattr(Image.Image, "mode", None), property):
+            self._mode = img.mode
+        else:  # Pillow < 10.1
+            self.mode = img.mode
+        self._frame_idx = frame
+
+    def tell(self):
+        return self._frame_idx
+
+
+def _downscale_batch(images, max_size):
+    """Resize a [B,H,W,C] batch on its device so the longest edge is at most `max_size` (0 = unchanged)."""
+    h, w = int(images.shape[1]), int(images.shape[2])
+    if not max_size or max(h, w) <= int(max_size):
+        return images
+    s = float(max_size) / float(max(h, w))
+    size = (max(1, int(round(h * s))), max(1, int(round(w * s))))
+    return torch.nn.functional.interpolate(
+        images.permute(0, 3, 1, 2).float(), size=size, mode="bilinear", align_corners=False, antialias=True
+    ).permute(0, 2, 3, 1)
+
+
+# uint8 bytes converted per bulk window when streaming frames to an encoder.
+_STREAM_WINDOW_BYTES = 8 * 1024 * 1024
+
+
+def _stream_window(images, max_size):
+    """Frames per bulk conversion window once downscaled to `max_size`."""
+    probe = _downscale_batch(images[:1], max_size)
+    return max(1, _STREAM_WINDOW_BYTES // max(1, probe[0].numel()))
+
+
+def _uint8_window(images, start, window, max_size):
+    return _tensor_batch_to_uint8(_downscale_batch(images[start:start + window], max_size))
+
+
+def _uint8_windows(images, max_size=0):
+    """The batch as encoded by `_frame_source`, one bulk uint8 window after the other."""
+    window = _stream_window(images, max_size)
+    for start in range(0, int(images.shape[0]), window):
+        yield _uint8_window(images, start, window, max_size)
 
 
-def save_temp_animated(images, prefix="imageops_anim", ext="webp", fps=12, quality=80):
+def _frame_source(images, max_size=0):
+    """
+    Frame index -> PIL image, converting a small window of frames at a time in bulk (one quantize + one
+    transfer per window), so only that window of uint8 frames is resident.
+    """
+    cache = {"start": -1, "frames": None}
+    window = None
+
+    def get(idx):
+        nonlocal window
+        if window is None:
+            window = _stream_window(images, max_size)
+        start = (idx // window) * window
+        if cache["start"] != start:
+            cache["frames"] = _uint8_window(images, start, window, max_size)
+            cache["start"] = start
+        return _uint8_to_pil(cache["frames"][idx - start])
+
+    return get
+
+
+def save_temp_animated(images, prefix="imageops_anim", ext="webp", fps=12, quality=80, compression="default",
+                       max_size=None, cache=None):
     """
     Save IMAGE batch as an animated WEBP (or GIF) in temp for node UI preview.
+    Frames are converted lazily while the encoder consumes them, so memory stays ~constant in frame count
+    (GIF still keeps each frame's palettized delta). `max_size` caps the longest edge (0 = full resolution).
+    With `cache` options the key is hashed from the same (downscaled) windows, streamed without keeping
+    them, and an existing file for that key is returned as is.
     """
-    temp_dir = _ensure_dir(folder_paths.get_temp_directory())
-    pil_list = _tensor_batch_to_pil_list(images)
-    if not pil_list:
+    if images is None:
+        raise ValueError("images is None")
+    if images.dim() != 4:
+        raise ValueError(f"Expected [B,H,W,C], got {tuple(images.shape)}")
+    count = int(images.shape[0])
+    if count == 0:
         return None
+    max_size = ANIM_MAX_SIZE if max_size is None else int(max_size)
+    temp_dir = _ensure_dir(folder_paths.get_temp_directory())
 
-    name = f"{prefix}_{uuid.uuid4().hex[:10]}.{ext}"
+    key = preview_key(_uint8_windows(images, max_size), *cache) if cache is not None else None
+    name = f"{prefix}_{key or uuid.uuid4().hex[:10]}.{ext}"
+    if key and _reuse(temp_dir, [name]):
+        logger.info(f"ImageOps preview: reused cached {ext} animation")
+        return _entry(name)
     out_path = os.path.join(temp_dir, name)
     duration_ms = int(max(1, round(1000.0 / max(1.0, float(fps)))))
 
+    t0 = time.perf_counter()
     try:
+        frame = _frame_source(images, max_size)
+        first = frame(0)
+        rest = [_LazyFrames(lambda i: frame(i + 1), count - 1)] if count > 1 else []
         if ext.lower() == "gif":
-            pil_list[0].save(
-                out_path,
+            save = lambda p: first.save(
+                p,
                 save_all=True,
-                append_images=pil_list[1:],
+                append_images=rest,
                 duration=duration_ms,
                 loop=0,
+                format="GIF",
                 optimize=True,
             )
         else:
             # animated WEBP
-            pil_list[0].save(
-                out_path,
+            save = lambda p: first.save(
+                p,
                 save_all=True,
-                append_images=pil_list[1:],
+                append_images=rest,
                 duration=duration_ms,
                 loop=0,
                 format="WEBP",
                 quality=int(quality),
-                method=6,
+                method=_preset(compression)["webp_method"],
             )
+        # convert + encode are interleaved while streaming
+        with phase("encode"):
+            _write(out_path, ext, save)
     except Exception as e:
         logger.error(f"Failed to save animated preview '{out_path}': {e}")
         return None
+    logger.info(f"ImageOps preview: streamed {count} frame(s) to {ext} in {(time.perf_counter() - t0) * 1000.0:.1f} ms")
+
+    return _entry(name)
+
 
-    return {"filename": name, "subfolder": "", "type": "temp"}
+def _strip_indices(count, max_frames, sampling="first"):
+    n = max(1, min(int(count), int(max_frames)))
+    if sampling == "even" and count > n:
+        if n == 1:
+            return [0]
+        return [int(round(i * (count - 1) / (n - 1))) for i in range(n)]
+    return list(range(n))
 
 
-def save_temp_strip(images, prefix="imageops_strip", ext="png", max_frames=16, tile_height=256, quality=95):
+def save_temp_strip(images, prefix="imageops_strip", ext="png", max_frames=16, tile_height=256, quality=95,
+                    compression="default", sampling="first", cache=None):
     """
     Save IMAGE batch as a single horizontal strip image for quick UI inspection.
+    Frames are picked (first N, or evenly spaced with sampling="even") and resized on the tensor side in
+    one batched interpolate, so only the strip itself is transferred and converted.
+    With `cache` options the key is hashed from that strip, and an existing file for it is returned as is.
     """
-    temp_dir = _ensure_dir(folder_paths.get_temp_directory())
-    pil_list = _tensor_batch_to_pil_list(images)
-    if not pil_list:
+    if images is None:
+        raise ValueError("images is None")
+    if images.dim() != 4:
+        raise ValueError(f"Expected [B,H,W,C], got {tuple(images.shape)}")
+    count, h, w = int(images.shape[0]), int(images.shape[1]), int(images.shape[2])
+    if count == 0 or h <= 0 or w <= 0:
         return None
+    temp_dir = _ensure_dir(folder_paths.get_temp_directory())
 
-    frames = pil_list[: int(max(1, max_frames))]
-    resized = []
-    for im in frames:
-        try:
-            w, h = im.size
-            if h <= 0:
-                continue
-            s = float(tile_height) / float(h)
-            nw = max(1, int(round(w * s)))
-            resized.append(im.resize((nw, int(tile_height)), resample=Image.BILINEAR))
-        except Exception:
-            continue
-    if not resized:
+    idx = _strip_indices(count, max_frames, sampling)
+    th = int(max(1, tile_height))
+    nw = max(1, int(round(w * float(th) / float(h))))
+    try:
+        with phase("convert"):
+            frames = images.detach()[torch.tensor(idx, device=images.device), ..., :3]
+            tiles = torch.nn.functional.interpolate(
+                frames.permute(0, 3, 1, 2).float(), size=(th, nw), mode="bilinear", align_corners=False, antialias=True
+            )
+            # [n,C,th,nw] -> [1,th,n*nw,C]: tiles side by side
+            strip_t = tiles.permute(2, 0, 3, 1).reshape(1, th, len(idx) * nw, tiles.shape[1])
+            strip_arr = _tensor_batch_to_uint8(strip_t)
+    except Exception as e:
+        logger.error(f"Failed to build strip preview: {e}")
         return None
+    key = preview_key([strip_arr], *cache) if cache is not None else None
+    name = f"{prefix}_{key or uuid.uuid4().hex[:10]}.{ext}"
+    if key and _reuse(temp_dir, [name]):
+        return _entry(name)
+    strip = _uint8_to_pil(strip_arr[0])
+    if strip.mode != "RGB":
+        strip = strip.convert("RGB")
 
-    total_w = sum(im.size[0] for im in resized)
-    out_h = resized[0].size[1]
-    strip = Image.new("RGB", (total_w, out_h), (0, 0, 0))
-    x = 0
-    for im in resized:
-        strip.paste(im.convert("RGB"), (x, 0))
-        x += im.size[0]
-
-    name = f"{prefix}_{uuid.uuid4().hex[:10]}.{ext}"
     out_path = os.path.join(temp_dir, name)
     try:
-        if ext.lower() in ("jpg", "jpeg"):
-            strip.save(out_path, quality=int(quality), optimize=True)
-        else:
-            strip.save(out_path)
+        with phase("encode"):
+            _write(out_path, ext, lambda p: _save_image(strip, p, ext, quality, compression))
     except Exception as e:
         logger.error(f"Failed to save strip preview '{out_path}': {e}")
         return None
 
-    return {"filename": name, "subfolder": "", "type": "temp"}
+    return _entry(name)
@@ -0,0 +1,116 @@
+import logging
+import threading
+from collections import OrderedDict
+
+from ._env import _get_int_env
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: keep encoded previews in process memory and serve them over HTTP instead of temp files + /view.
+PREVIEW_MEMORY = bool(_get_int_env("IMAGEOPS_PREVIEW_MEMORY", 0))
+PREVIEW_MEMORY_MB = _get_int_env("IMAGEOPS_PREVIEW_MEMORY_MB", 256)
+
+ROUTE = "/imageops/preview/{name}"
+MEMORY_TYPE = "imageops_memory"
+
+_CONTENT_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "gif": "image/gif",
+}
+
+
+class PreviewStore:
+    """Thread-safe LRU of encoded preview bytes, bounded by total size."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = int(max_bytes)
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, name, data):
+        data = bytes(data)
+        with self._lock:
+            old = self._items.pop(name, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._items[name] = data
+            self._bytes += len(data)
+            # The newest entry always stays, even if it alone exceeds the budget.
+            while self._bytes > self.max_bytes and len(self._items) > 1:
+                _, dropped = self._items.popitem(last=False)
+                self._bytes -= len(dropped)
+
+    def get(self, name):
+        with self._lock:
+            data = self._items.get(name)
+            if data is not None:
+                self._items.move_to_end(name)
+            return data
+
+    def touch(self, names):
+        """True if every name is stored (each is marked recently used)."""
+        with self._lock:
+            if not all(n in self._items for n in names):
+                return False
+            for n in names:
+                self._items.move_to_end(n)
+            return True
+
+    @property
+    def total_bytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._items)
+
+
+STORE = PreviewStore(PREVIEW_MEMORY_MB * 1024 * 1024)
+
+
+def content_type(name):
+    return _CONTENT_TYPES.get(name.rsplit(".", 1)[-1].lower(), "application/octet-stream")
+
+
+async def handle_preview(request):
+    from aiohttp import web
+
+    name = request.match_info["name"]
+    data = STORE.get(name)
+    if data is None:
+        return web.Response(status=404, text="preview expired or unknown")
+    # Names are content-addressed or unique per run, so the bytes behind a name never change.
+    return web.Response(body=data, content_type=content_type(name), headers={"Cache-Control": "private, max-age=3600"})
+
+
+def register_routes(routes):
+    """Add the preview GET route to an aiohttp RouteTableDef (ComfyUI's `PromptServer.instance.routes`)."""
+    routes.get(ROUTE)(handle_preview)
+
+
+_SERVED = False
+
+
+def memory_enabled():
+    """True when IMAGEOPS_PREVIEW_MEMORY is on and the route is registered; otherwise previews use temp files."""
+    return _SERVED
+
+
+def _register_with_comfy():
+    global _SERVED
+    if not PREVIEW_MEMORY:
+        return
+    try:
+        from server import PromptServer
+
+        register_routes(PromptServer.instance.routes)
+    except Exception as e:
+        logger.warning(f"ImageOps in-memory previews disabled (cannot register {ROUTE}): {e}")
+        return
+    _SERVED = True
+
+
+_register_with_comfy()
@@ -0,0 +1,211 @@
+import functools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+from ._env import _get_int_env
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: with IMAGEOPS_PROFILE unset, `profiled` returns the method untouched and `phase` a shared no-op.
+PROFILE = bool(_get_int_env("IMAGEOPS_PROFILE", 0))
+PROFILE_HISTORY = _get_int_env("IMAGEOPS_PROFILE_HISTORY", 256)
+
+_RECORDS = deque(maxlen=max(1, PROFILE_HISTORY))
+_LOCK = threading.Lock()
+_LOCAL = threading.local()
+_NOOP = nullcontext()
+_PROC_STATUS = "/proc/self/status"
+_PROC_CLEAR_REFS = "/proc/self/clear_refs"
+
+
+def _describe(value):
+    import torch
+
+    if isinstance(value, torch.Tensor):
+        return {"shape": list(value.shape), "dtype": str(value.dtype).replace("torch.", ""), "device": str(value.device)}
+    if isinstance(value, dict) and "ui" in value:
+        return {"ui": {k: len(v) if isinstance(v, (list, tuple)) else 1 for k, v in value["ui"].items()}}
+    return None
+
+
+def _read_hwm_kb():
+    try:
+        with open(_PROC_STATUS, encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class _MemoryProbe:
+    """
+    Peak bytes allocated during one call: CUDA allocator stats for CUDA inputs, otherwise the process RSS
+    high-water mark (Linux, reset per call), falling back to tracemalloc peak where /proc is unavailable.
+    """
+
+    def __init__(self, devices):
+        self.cuda = next((d for d in devices if d.type == "cuda"), None)
+        self.kind = None
+
+    def start(self):
+        if self.cuda is not None:
+            import torch
+
+            torch.cuda.synchronize(self.cuda)
+            torch.cuda.reset_peak_memory_stats(self.cuda)
+            self.base = torch.cuda.memory_allocated(self.cuda)
+            self.kind = "cuda_allocator"
+            return
+        try:
+            with open(_PROC_CLEAR_REFS, "w", encoding="ascii") as f:
+                f.write("5")  # reset VmHWM to current RSS
+            self.base = _read_hwm_kb()
+            if self.base is not None:
+                self.kind = "rss_hwm"
+                return
+        except OSError:
+            pass
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self.base = tracemalloc.get_traced_memory()[0]
+        self.kind = "tracemalloc"
+
+    def stop(self):
+        if self.kind == "cuda_allocator":
+            import torch
+
+            torch.cuda.synchronize(self.cuda)
+            peak = torch.cuda.max_memory_allocated(self.cuda) - self.base
+        elif self.kind == "rss_hwm":
+            peak = ((_read_hwm_kb() or self.base) - self.base) * 1024
+        else:
+            import tracemalloc
+
+            peak = tracemalloc.get_traced_memory()[1] - self.base
+        return {"peak_bytes": int(max(0, peak)), "source": self.kind}
+
+
+@functools.lru_cache(maxsize=None)
+def _signature(fn):
+    import inspect
+
+    return inspect.signature(fn)
+
+
+def profiled(method):
+    """Decorator for node entry points (`apply` / `preview`); identity when profiling is disabled."""
+    if not PROFILE:
+        return method
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        import torch
+
+        try:
+            bound = _signature(method).bind(self, *args, **kwargs).arguments
+        except TypeError:
+            bound = dict(kwargs)
+        inputs = {k: d for k, d in ((k, _describe(v)) for k, v in bound.items() if k != "self") if d is not None}
+        devices = [v.device for v in bound.values() if isinstance(v, torch.Tensor)]
+
+        record = {"node": type(self).__name__, "inputs": inputs, "phases_ms": {}}
+        parent = getattr(_LOCAL, "record", None)
+        _LOCAL.record = record
+        probe = _MemoryProbe(devices)
+        probe.start()
+        t0 = time.perf_counter()
+        result = None
+        try:
+            result = method(self, *args, **kwargs)
+            return result
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            if probe.cuda is not None:
+                torch.cuda.synchronize(probe.cuda)  # time the queued kernels, not just their launch
+            record["wall_ms"] = round((time.perf_counter() - t0) * 1000.0, 3)
+            record["memory"] = probe.stop()
+            _LOCAL.record = parent
+            if isinstance(result, tuple):
+                record["outputs"] = [d for d in (_describe(v) for v in result) if d is not None]
+            elif isinstance(result, dict):
+                record["outputs"] = [_describe(result)]
+            _finish(record)
+
+    return wrapper
+
+
+def _finish(record):
+    record["time"] = time.time()
+    with _LOCK:
+        _RECORDS.append(record)
+    logger.info("ImageOps profile %s", json.dumps(record, default=str))
+
+
+class _Phase:
+    __slots__ = ("name", "record", "t0")
+
+    def __init__(self, name, record):
+        self.name = name
+        self.record = record
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        ms = (time.perf_counter() - self.t0) * 1000.0
+        phases = self.record["phases_ms"]
+        phases[self.name] = round(phases.get(self.name, 0.0) + ms, 3)
+        return False
+
+
+def phase(name):
+    """Time a named sub-phase (e.g. preview encode) into the enclosing profiled call; no-op otherwise."""
+    if not PROFILE:
+        return _NOOP
+    record = getattr(_LOCAL, "record", None)
+    return _NOOP if record is None else _Phase(name, record)
+
+
+def profile_records():
+    """Most recent profiled calls (up to IMAGEOPS_PROFILE_HISTORY), oldest first."""
+    with _LOCK:
+        return list(_RECORDS)
+
+
+def profile_summary():
+    """Per-node rollup of the rolling history: calls, wall time stats, peak memory, summed phase times."""
+    out = {}
+    for r in profile_records():
+        s = out.setdefault(r["node"], {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                       "max_peak_bytes": 0, "phases_ms": {}, "_walls": []})
+        s["calls"] += 1
+        s["errors"] += int("error" in r)
+        s["total_ms"] += r["wall_ms"]
+        s["max_ms"] = max(s["max_ms"], r["wall_ms"])
+        s["max_peak_bytes"] = max(s["max_peak_bytes"], r["memory"]["peak_bytes"])
+        s["_walls"].append(r["wall_ms"])
+        for k, v in r["phases_ms"].items():
+            s["phases_ms"][k] = round(s["phases_ms"].get(k, 0.0) + v, 3)
+    for s in out.values():
+        walls = sorted(s.pop("_walls"))
+        s["total_ms"] = round(s["total_ms"], 3)
+        s["mean_ms"] = round(s["total_ms"] / s["calls"], 3)
+        s["median_ms"] = walls[len(walls) // 2]
+    return out
+
+
+def reset_profile():
+    with _LOCK:
+        _RECORDS.clear()
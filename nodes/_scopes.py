@@ -0,0 +1,118 @@
+import base64
+
+import torch
+
+from ._env import _get_int_env
+from ._ops_constants import LUMA_WEIGHTS
+
+# Bin layout matches js/preview/scopes.js (computeScopes) so the browser can draw either source.
+WAVE_WIDTH = 256
+WAVE_HEIGHT = 64
+VEC_SIZE = 96
+# per_frame payloads carry ~75k bins (~400 KB base64) per frame; frames past this cap are only in the aggregate.
+SCOPES_MAX_FRAMES = _get_int_env("IMAGEOPS_SCOPES_MAX_FRAMES", 8)
+
+# Pixels binned per block: keeps every temporary cache-sized (same idea as run_pointwise).
+_SCOPE_BLOCK_PIXELS = 1 << 16
+
+
+def _scope_matrix(device):
+    """[6,3] projection of RGB onto (Y, R, G, B, Cb, -Cr); with `_SCOPE_BIAS` this is one addmm per block."""
+    m = torch.zeros((6, 3), dtype=torch.float32, device=device)
+    m[0] = torch.tensor(LUMA_WEIGHTS)
+    m[1:4] = torch.eye(3)
+    m[4] = torch.tensor((-0.168736, -0.331264, 0.5))
+    m[5] = -torch.tensor((0.5, -0.418688, -0.081312))
+    return m
+
+
+# Cb and -Cr are shifted into 0..1 (JS: cb + 0.5, 0.5 - cr).
+_SCOPE_BIAS = ((0.0,), (0.0,), (0.0,), (0.0,), (0.5,), (0.5,))
+
+
+def _bin_block(x, proj, bias, wave_idx, wave_w, wave_h, vec_size):
+    """
+    Bins for one [rows,W,3] block in 0..1. The block is projected to planar [6,P] so every following op is
+    contiguous; luma and R/G/B waveforms share one index pass and one bincount (`wave_idx` carries each
+    pixel's waveform column plus a per-plane bin offset).
+    """
+    z = torch.addmm(bias, proj, x.reshape(-1, 3).t())
+
+    levels = z[:4].clamp_(0, 1)
+    hist = torch.bincount((levels[0] * 255.0).to(torch.int32).clamp_(0, 255), minlength=256)
+
+    rows = torch.rsub(levels, 1.0).mul_(wave_h - 1).to(torch.int32).clamp_(0, wave_h - 1)
+    idx = rows.view(4, x.shape[0], x.shape[1]).mul_(wave_w).add_(wave_idx)
+    waves = torch.bincount(idx.reshape(-1), minlength=4 * wave_h * wave_w).view(4, -1)
+
+    v = z[4:].mul_(vec_size - 1).to(torch.int32).clamp_(0, vec_size - 1)
+    vec = torch.bincount(v[1].mul_(vec_size).add_(v[0]), minlength=vec_size * vec_size)
+
+    return {
+        "hist": hist,
+        "waveform": waves[0],
+        "waveform_r": waves[1],
+        "waveform_g": waves[2],
+        "waveform_b": waves[3],
+        "vectorscope": vec,
+    }
+
+
+def compute_scopes(images, wave_width=WAVE_WIDTH, wave_height=WAVE_HEIGHT, vec_size=VEC_SIZE):
+    """
+    Histogram (luma, 256 bins), luma/R/G/B waveforms and a Cb/Cr vectorscope for every pixel of a
+    [B,H,W,C] batch, computed on the tensor's device. Returns {name: [B, bins] int64 tensor}; sum over
+    dim 0 for the batch aggregate. Alpha is ignored, single-channel input is treated as gray.
+    """
+    if images is None:
+        raise ValueError("images is None")
+    if images.dim() != 4:
+        raise ValueError(f"Expected [B,H,W,C], got {tuple(images.shape)}")
+    B, H, W, C = (int(v) for v in images.shape)
+    wave_w, wave_h, vec_size = int(wave_width), int(wave_height), int(vec_size)
+    src = images.detach()
+    dev = src.device
+    # Waveform column of every image column (JS: floor(x / (W-1) * (waveW-1))), offset per (Y, R, G, B) plane.
+    col = (torch.arange(W, device=dev, dtype=torch.float32) / max(1, W - 1) * (wave_w - 1)).to(torch.int32)
+    plane = torch.arange(4, device=dev, dtype=torch.int32) * (wave_h * wave_w)
+    wave_idx = col.view(1, 1, W) + plane.view(4, 1, 1)
+    proj = _scope_matrix(dev)
+    bias = torch.tensor(_SCOPE_BIAS, dtype=torch.float32, device=dev)
+    rows = max(1, min(H, _SCOPE_BLOCK_PIXELS // max(1, W)))
+
+    out = None
+    for i in range(B):
+        for r0 in range(0, H, rows):
+            x = src[i, r0:r0 + rows]
+            x = x[..., :3] if C >= 3 else x[..., :1].expand(-1, -1, 3)
+            bins = _bin_block(torch.clamp(x.float(), 0, 1), proj, bias, wave_idx, wave_w, wave_h, vec_size)
+            if out is None:
+                out = {k: torch.zeros((B, v.numel()), dtype=torch.int64, device=dev) for k, v in bins.items()}
+            for k, v in bins.items():
+                out[k][i] += v
+    return out or {}
+
+
+def scopes_payload(images, per_frame=False, **sizes):
+    """
+    JSON-ready scope bins for a node `ui` payload: batch aggregate (int lists, totals can pass 32 bits), plus
+    the first SCOPES_MAX_FRAMES frames when `per_frame`, each bin array as base64 little-endian uint32
+    (a frame never has 2^32 pixels). The frontend shows the frame selected in the node's gallery.
+    """
+    bins = compute_scopes(images, **sizes)
+    if not bins:
+        return None
+    payload = {
+        "frames": int(images.shape[0]),
+        "wave_width": int(sizes.get("wave_width", WAVE_WIDTH)),
+        "wave_height": int(sizes.get("wave_height", WAVE_HEIGHT)),
+        "vec_size": int(sizes.get("vec_size", VEC_SIZE)),
+        "aggregate": {k: v.sum(0).tolist() for k, v in bins.items()},
+    }
+    if per_frame:
+        n = min(payload["frames"], max(0, SCOPES_MAX_FRAMES))
+        host = {k: v[:n].to(torch.int32).cpu().numpy().astype("<u4") for k, v in bins.items()}
+        payload["per_frame_encoding"] = "base64_uint32le"
+        payload["per_frame"] = [{k: base64.b64encode(v[i].tobytes()).decode("ascii") for k, v in host.items()}
+                                for i in range(n)]
+    return payload
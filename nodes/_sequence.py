@@ -0,0 +1,203 @@
+import fnmatch
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+from PIL import Image, ImageOps
+
+from ._helpers import ALLOWED_EXTENSIONS, LARGE_IMAGE_WARN_MB, _get_int_env, _pil_has_alpha, _pil_to_uint8, logger
+from ._spill import empty_batch, is_spilled
+
+DECODE_WORKERS = _get_int_env("IMAGEOPS_DECODE_WORKERS", min(8, os.cpu_count() or 1))
+# Decoded frames are kept as uint8 (a quarter of the float32 IMAGE size); 0 = no cache.
+FRAME_CACHE_MB = _get_int_env("IMAGEOPS_FRAME_CACHE_MB", 1024)
+# Folders Load Sequence may read besides ComfyUI's input and output directories (os.pathsep-separated).
+SEQUENCE_ROOTS = [p.strip() for p in os.environ.get("IMAGEOPS_SEQUENCE_ROOTS", "").split(os.pathsep) if p.strip()]
+
+_EXIF_ORIENTATION = 0x0112
+
+
+class FrameCache:
+    """Thread-safe LRU of decoded uint8 frames keyed by (path, mtime_ns, size, channels), bounded by total bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = int(max_bytes)
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            arr = self._items.get(key)
+            if arr is not None:
+                self._items.move_to_end(key)
+            return arr
+
+    def put(self, key, arr):
+        if arr.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._items[key] = arr
+            self._bytes += arr.nbytes
+            while self._bytes > self.max_bytes and self._items:
+                _, dropped = self._items.popitem(last=False)
+                self._bytes -= dropped.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    @property
+    def total_bytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._items)
+
+
+FRAME_CACHE = FrameCache(FRAME_CACHE_MB * 1024 * 1024)
+
+
+def _natural_key(name):
+    return [int(t) if t.isdigit() else t.lower() for t in re.split(r"(\d+)", name)]
+
+
+def resolve_directory(directory):
+    """
+    Folder to read: relative paths under ComfyUI's input directory. The result must lie inside the input or
+    output directory or an IMAGEOPS_SEQUENCE_ROOTS entry (the `commonpath` rule Save Sequence applies to writes).
+    """
+    import folder_paths
+
+    target = os.path.abspath(os.path.join(folder_paths.get_input_directory(), str(directory).strip()))
+    roots = [folder_paths.get_input_directory(), folder_paths.get_output_directory()] + SEQUENCE_ROOTS
+    for root in roots:
+        root = os.path.abspath(os.path.expanduser(root))
+        try:
+            if os.path.commonpath((root, target)) == root:
+                return target
+        except ValueError:  # different drives
+            continue
+    raise ValueError(f"Sequence directory '{directory}' is outside ComfyUI's input/output directories "
+                     f"(allow more folders with IMAGEOPS_SEQUENCE_ROOTS)")
+
+
+def list_frames(directory, pattern="*"):
+    """Image files in `directory` matching the glob `pattern`, in natural order (frame_2 before frame_10)."""
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Sequence directory not found: {directory}")
+    pattern = str(pattern or "*")
+    names = [
+        n for n in os.listdir(directory)
+        if os.path.splitext(n)[1].lower() in ALLOWED_EXTENSIONS and fnmatch.fnmatch(n, pattern)
+    ]
+    return [os.path.join(directory, n) for n in sorted(names, key=_natural_key)]
+
+
+def select_frames(paths, start=0, count=0, stride=1):
+    """Every `stride`-th path from index `start`, at most `count` of them (0 = all)."""
+    picked = paths[max(0, int(start))::max(1, int(stride))]
+    return picked[:int(count)] if int(count) > 0 else picked
+
+
+def sequence_signature(paths):
+    """Changes whenever a selected file is added, removed, replaced or touched."""
+    h = hashlib.sha256()
+    for p in paths:
+        st = os.stat(p)
+        h.update(repr((p, st.st_mtime_ns, st.st_size)).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _orientation(img):
+    try:
+        return int(img.getexif().get(_EXIF_ORIENTATION, 1))
+    except Exception:
+        return 1
+
+
+def _decode(path, channels, use_cache):
+    """uint8 [H,W,channels] frame from the cache or the file; (array, cache_hit)."""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size, channels)
+    arr = FRAME_CACHE.get(key) if use_cache else None
+    if arr is not None:
+        return arr, True
+    with Image.open(path) as img:
+        if 2 <= _orientation(img) <= 8:
+            img = ImageOps.exif_transpose(img)  # like LoadImage
+        arr = _pil_to_uint8(img, channels)
+    if use_cache:
+        FRAME_CACHE.put(key, arr)
+    return arr, False
+
+
+def load_sequence(paths, workers=None):
+    """
+    Decode `paths` into one preallocated float32 [B,H,W,C] tensor. Frames are decoded on a thread pool
+    (PIL releases the GIL while decoding) and each worker writes its frame's slice in place, with the
+    same values as `_pil_to_tensor`. Size and alpha come from the first frame's header: other frames are
+    converted to its channel count, a different size is an error. Batches above IMAGEOPS_SPILL_MB are
+    decoded straight into a spill file. Returns (images, stats).
+    """
+    if not paths:
+        raise ValueError("No frames to load")
+    with Image.open(paths[0]) as first:
+        W, H = first.size
+        if _orientation(first) in (5, 6, 7, 8):  # EXIF rotation by 90 degrees
+            W, H = H, W
+        C = 4 if _pil_has_alpha(first) else 3
+    B = len(paths)
+    mb = B * H * W * C * 4 / (1024 * 1024)
+    out = empty_batch((B, H, W, C), torch.float32)
+    if mb > float(LARGE_IMAGE_WARN_MB) and not is_spilled(out):
+        logger.warning(f"Large image allocation: {B}x{W}x{H}x{C} (~{mb:.1f} MB) > {LARGE_IMAGE_WARN_MB} MB")
+    # A spilled sequence outgrows the cache: a re-run would cycle the LRU without a single hit.
+    use_cache = FRAME_CACHE_MB > 0 and not is_spilled(out)
+    hits = []
+
+    def frame(i):
+        arr, hit = _decode(paths[i], C, use_cache)
+        if arr.shape[:2] != (H, W):
+            raise ValueError(f"Frame size mismatch: {paths[i]} is {arr.shape[1]}x{arr.shape[0]}, expected {W}x{H}")
+        torch.div(torch.from_numpy(arr), 255.0, out=out[i])
+        if hit:
+            hits.append(i)
+
+    t0 = time.perf_counter()
+    workers = max(1, min(int(DECODE_WORKERS if workers is None else workers), B))
+    if workers == 1:
+        for i in range(B):
+            frame(i)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="imageops_decode") as pool:
+            list(pool.map(frame, range(B)))
+    seconds = max(1e-9, time.perf_counter() - t0)
+
+    stats = {
+        "frames": B,
+        "decoded": B - len(hits),
+        "cached": len(hits),
+        "width": W,
+        "height": H,
+        "channels": C,
+        "workers": workers,
+        "spilled": is_spilled(out),
+        "ms": round(seconds * 1000.0, 2),
+        "fps": round(B / seconds, 2),
+        "mpix_per_s": round(B * H * W / 1e6 / seconds, 2),
+    }
+    logger.info(
+        f"ImageOps sequence: {B} frames {W}x{H}x{C} in {stats['ms']:.0f} ms "
+        f"({stats['fps']:.1f} fps, {stats['mpix_per_s']:.1f} Mpix/s, {len(hits)} cached, {workers} workers)"
+    )
+    return out, stats
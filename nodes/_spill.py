@@ -0,0 +1,132 @@
+import errno
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+import weakref
+
+import numpy as np
+import torch
+
+from ._helpers import _get_int_env, logger
+
+# CPU batches larger than this are allocated in a memory-mapped file instead of RAM (0 = never spill).
+SPILL_MB = _get_int_env("IMAGEOPS_SPILL_MB", 0)
+# Where spill files go; empty = an `imageops_spill` folder in ComfyUI's temp directory (wiped on startup).
+SPILL_DIR = os.environ.get("IMAGEOPS_SPILL_DIR", "").strip()
+
+# numpy has no bfloat16: those buffers are mapped as uint16 and reinterpreted.
+_NUMPY_DTYPES = {
+    torch.float32: np.float32,
+    torch.float16: np.float16,
+    torch.bfloat16: np.uint16,
+    torch.uint8: np.uint8,
+}
+
+# Storage address -> (spill file, bytes) for every live spilled buffer (views share their base's storage).
+_SPILLED = {}
+_LOCK = threading.Lock()
+
+
+def spill_directory():
+    directory = SPILL_DIR
+    if not directory:
+        try:
+            import folder_paths
+
+            base = folder_paths.get_temp_directory()
+        except Exception:
+            base = tempfile.gettempdir()
+        directory = os.path.join(base, "imageops_spill")
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def should_spill(nbytes, device="cpu"):
+    return SPILL_MB > 0 and torch.device(device).type == "cpu" and int(nbytes) > SPILL_MB * 1024 * 1024
+
+
+def is_spilled(t):
+    """True when `t` (or the tensor it views) lives in a spill file."""
+    if not isinstance(t, torch.Tensor) or t.device.type != "cpu" or not _SPILLED:
+        return False
+    try:
+        return t.untyped_storage().data_ptr() in _SPILLED
+    except RuntimeError:
+        return False
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _release(ptr, path):
+    with _LOCK:
+        _SPILLED.pop(ptr, None)
+    _remove(path)
+
+
+def _reserve(path, nbytes):
+    """Allocate the file's blocks up front: writing through a mapping onto a full disk is a SIGBUS, not an error."""
+    if hasattr(os, "posix_fallocate"):
+        with open(path, "r+b") as f:
+            try:
+                os.posix_fallocate(f.fileno(), 0, os.fstat(f.fileno()).st_size)
+                return
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    raise
+    free = shutil.disk_usage(os.path.dirname(path)).free
+    if free < nbytes:
+        raise OSError(errno.ENOSPC, f"{free / (1024 * 1024):.0f} MB free, {nbytes / (1024 * 1024):.0f} MB needed", path)
+
+
+def spill_empty(shape, dtype=torch.float32):
+    """
+    Uninitialized CPU tensor of `shape` backed by a memory-mapped .npy file. It is an ordinary tensor to
+    every consumer; the OS pages frames in and out, so only the windows being touched occupy RAM. On
+    POSIX the file is unlinked as soon as it is mapped; elsewhere it is deleted with the last view.
+    """
+    if dtype not in _NUMPY_DTYPES:
+        raise TypeError(f"Cannot spill dtype {dtype}")
+    shape = tuple(int(s) for s in shape)
+    nbytes = int(np.prod(shape)) * torch.empty((), dtype=dtype).element_size()
+    path = os.path.join(spill_directory(), f"spill_{os.getpid()}_{uuid.uuid4().hex}.npy")
+    try:
+        arr = np.lib.format.open_memmap(path, mode="w+", dtype=_NUMPY_DTYPES[dtype], shape=shape)
+        _reserve(path, nbytes)
+    except Exception:
+        _remove(path)
+        raise
+    if os.name == "posix":
+        # The mapping keeps the blocks; unlinking now means even a killed process leaves nothing behind.
+        _remove(path)
+    t = torch.from_numpy(arr)
+    if dtype == torch.bfloat16:
+        t = t.view(torch.bfloat16)
+    ptr = t.untyped_storage().data_ptr()
+    with _LOCK:
+        _SPILLED[ptr] = (path, nbytes)
+    # The tensor storage holds the memmap, so it dies with the last view of the buffer.
+    weakref.finalize(arr, _release, ptr, path)
+    logger.debug(f"ImageOps spill: {shape} {dtype} ({nbytes / (1024 * 1024):.0f} MB) -> {path}")
+    return t
+
+
+def empty_batch(shape, dtype=torch.float32, device="cpu"):
+    """`torch.empty`, or a spill file when the tensor would exceed IMAGEOPS_SPILL_MB."""
+    nbytes = int(np.prod([int(s) for s in shape])) * torch.empty((), dtype=dtype).element_size()
+    if dtype in _NUMPY_DTYPES and should_spill(nbytes, device):
+        return spill_empty(shape, dtype)
+    return torch.empty(tuple(shape), dtype=dtype, device=device)
+
+
+def spill_stats():
+    """Live spilled buffers and their total size."""
+    with _LOCK:
+        sizes = list(_SPILLED.values())
+    return {"buffers": len(sizes), "bytes": sum(n for _, n in sizes)}
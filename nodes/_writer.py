@@ -0,0 +1,173 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from ._env import _get_int_env
+
+logger = logging.getLogger(__name__)
+
+WRITER_WORKERS = _get_int_env("IMAGEOPS_WRITER_WORKERS", min(4, os.cpu_count() or 1))
+# Quantized frames waiting to be written; submitting blocks beyond this (backpressure on the producer).
+WRITER_QUEUE_MB = _get_int_env("IMAGEOPS_WRITER_QUEUE_MB", 2048)
+WRITER_HISTORY = 64
+
+FORMATS = ("png", "tiff", "webp", "npy")
+_EXTENSIONS = {"png": "png", "tiff": "tif", "webp": "webp", "npy": "npy"}
+
+
+def extension(fmt):
+    return _EXTENSIONS[fmt]
+
+
+def encode_file(arr, path, fmt, compression="default", quality=95):
+    """Write one uint8 [H,W,C] frame (or a [B,H,W,C] stack for npy) atomically; returns bytes written."""
+    import numpy as np
+
+    from ._helpers import _uint8_to_pil
+    from ._preview import _atomic_save, _preset
+
+    preset = _preset(compression)
+    ext = extension(fmt)
+    if fmt == "npy":
+        def save(p):
+            with open(p, "wb") as f:
+                np.save(f, arr)
+    else:
+        img = _uint8_to_pil(arr)
+        if fmt == "tiff":
+            def save(p):
+                img.save(p, format="TIFF", compression=preset["tiff_compression"])
+        elif fmt == "webp":
+            def save(p):
+                img.save(p, format="WEBP", quality=int(quality), method=preset["webp_method"],
+                         lossless=int(quality) >= 100)
+        else:
+            def save(p):
+                img.save(p, format="PNG", compress_level=preset["png_level"])
+    _atomic_save(path, ext, save)
+    return os.path.getsize(path)
+
+
+class WriteJob:
+    """Progress of one submitted batch; `stats()` reports files, bytes and bytes/sec once done."""
+
+    def __init__(self, directory, total):
+        self.directory = directory
+        self.total = int(total)
+        self.files = 0
+        self.bytes = 0
+        self.errors = []
+        self.started = time.perf_counter()
+        self.finished = None
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+
+    def _record(self, size=None, error=None):
+        with self._lock:
+            if error is None:
+                self.files += 1
+                self.bytes += int(size)
+            else:
+                self.errors.append(error)
+            if self.files + len(self.errors) == self.total:
+                self.finished = time.perf_counter()
+                return True
+        return False
+
+    def stats(self):
+        seconds = ((self.finished or time.perf_counter()) - self.started)
+        return {
+            "directory": self.directory,
+            "files": self.files,
+            "total": self.total,
+            "bytes": self.bytes,
+            "seconds": round(seconds, 3),
+            "mb_per_s": round(self.bytes / (1024 * 1024) / max(1e-9, seconds), 2),
+            "done": self.done.is_set(),
+            "errors": list(self.errors),
+        }
+
+
+class SequenceWriter:
+    """
+    Bounded background writer. Frames are encoded on a thread pool while the caller moves on to the next
+    prompt; `submit` blocks while queued bytes exceed `max_bytes`, so a slow disk throttles the producer
+    instead of piling up frames in memory.
+    """
+
+    def __init__(self, workers, max_bytes):
+        self.workers = max(1, int(workers))
+        self.max_bytes = int(max_bytes)
+        self._pool = None
+        self._pending = 0
+        self._cond = threading.Condition()
+        self.history = deque(maxlen=WRITER_HISTORY)
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="imageops_writer")
+        return self._pool
+
+    def _reserve(self, n):
+        with self._cond:
+            # One item larger than the whole budget still goes through once the queue has drained.
+            while self._pending > 0 and self._pending + n > self.max_bytes:
+                self._cond.wait()
+            self._pending += n
+
+    def _release(self, n):
+        with self._cond:
+            self._pending -= n
+            self._cond.notify_all()
+
+    @property
+    def pending_bytes(self):
+        return self._pending
+
+    def submit(self, items, directory, fmt, compression="default", quality=95, total=None):
+        """
+        Queue `items` [(array, path), ...] for writing; returns the WriteJob tracking them. `items` may be
+        a generator (give `total`): it is only advanced as the queue has room, so frames are produced lazily.
+        """
+        job = WriteJob(directory, len(items) if total is None else total)
+        self.history.append(job)
+        if not job.total:
+            job.finished = job.started
+            job.done.set()
+            return job
+        for arr, path in items:
+            self._reserve(arr.nbytes)
+            self._executor().submit(self._write, job, arr, path, fmt, compression, quality)
+        return job
+
+    def _write(self, job, arr, path, fmt, compression, quality):
+        try:
+            last = job._record(size=encode_file(arr, path, fmt, compression, quality))
+        except Exception as e:
+            logger.error(f"ImageOps writer failed on {path}: {e}")
+            last = job._record(error=f"{os.path.basename(path)}: {type(e).__name__}: {e}")
+        finally:
+            self._release(arr.nbytes)
+        if last:
+            job.done.set()
+            s = job.stats()
+            logger.info(
+                f"ImageOps sequence written: {s['files']}/{s['total']} file(s), {s['bytes'] / (1024 * 1024):.1f} MB "
+                f"in {s['seconds']:.2f} s ({s['mb_per_s']:.1f} MB/s) -> {s['directory']}"
+            )
+
+    def flush(self, timeout=None):
+        """Wait until every queued frame is written; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout)
+
+
+WRITER = SequenceWriter(WRITER_WORKERS, WRITER_QUEUE_MB * 1024 * 1024)
+
+
+def writer_stats():
+    """Stats of recently submitted jobs, oldest first."""
+    return [job.stats() for job in list(WRITER.history)]
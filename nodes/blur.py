@@ -1,4 +1,5 @@
-from ._helpers import _apply_blur, _apply_mask_to_image, _select_media_tensor
+from ._layout import HIDDEN_INPUTS, hand_off
+from ._profiling import profiled
 
 
 class ImageOpsBlur:
@@ -18,12 +19,35 @@ class ImageOpsBlur:
             "optional": {
                 "video": ("IMAGE", {"tooltip": "Video frames (alias for image input)", "forceInput": True}),
                 "mask": ("MASK",),
-            }
+            },
+            "hidden": HIDDEN_INPUTS,
         }
 
-    def apply(self, image, bypass, radius, sigma, video=None, mask=None):
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        from ._memo import changed_signature
+
+        return changed_signature(kwargs)
+
+    @profiled
+    def apply(self, image, bypass, radius, sigma, video=None, mask=None, prompt=None, unique_id=None):
+        from ._exec import crops_frames, run_batched
+        from ._helpers import _apply_blur, _select_media_tensor
+        from ._memo import memoized
+
         source = _select_media_tensor(image, video)
         if bool(bypass):
-            return (source,)
-        processed = _apply_blur(source, radius, sigma)
-        return (_apply_mask_to_image(source, processed, mask),)
+            return (hand_off(source, prompt, unique_id),)
+        if int(radius) <= 0:
+            return (hand_off(source, prompt, unique_id),)  # 1-tap kernel: identity
+        # FFT rounding follows the region it transforms: tiles and mask ROIs use the direct convolution.
+        fft = not crops_frames(source, mask)
+        # permute copy + two padded copies + two conv outputs (or FFT spectra) per frame
+        return (hand_off(memoized(
+            "blur",
+            (int(radius), float(sigma)),
+            lambda: run_batched(lambda t: _apply_blur(t, radius, sigma, fft), source, mask=mask, work_factor=8,
+                                halo=int(radius)),
+            source,
+            mask,
+        ), prompt, unique_id),)
@@ -1,4 +1,4 @@
-from ._helpers import _apply_clamp, _apply_mask_to_image, _select_media_tensor
+from ._profiling import profiled
 
 class ImageOpsClamp:
     CATEGORY = "image/imageops"
@@ -20,10 +20,21 @@ class ImageOpsClamp:
             }
         }
 
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        from ._memo import changed_signature
+
+        return changed_signature(kwargs)
+
+    @profiled
     def apply(self, image=None, bypass=False, min_v=0.0, max_v=1.0, video=None, mask=None):
+        from ._exec import run_batched, run_pointwise
+        from ._helpers import _apply_clamp, _select_media_tensor, FUSED_POINTWISE
+
         src = _select_media_tensor(image, video)
         if bool(bypass):
             return (src,)
-        out = _apply_clamp(src, min_v, max_v)
-        out = _apply_mask_to_image(src, out, mask)
+        if FUSED_POINTWISE:
+            return (run_pointwise(lambda t: _apply_clamp(t, min_v, max_v), src, mask=mask),)
+        out = run_batched(lambda t: _apply_clamp(t, min_v, max_v), src, mask=mask, work_factor=2, halo=0)
         return (out,)
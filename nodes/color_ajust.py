@@ -1,9 +1,8 @@
-from ._helpers import (
-    _apply_color_correct,
-    _apply_huesat,
-    _apply_mask_to_image,
-    _select_media_tensor,
-)
+from ._profiling import profiled
+
+_LUT_SIZES = {"lut_33": 33, "lut_65": 65}
+# brightness, contrast, gamma, saturation, hue_deg, hs_saturation, hs_value
+_NEUTRAL = (0.0, 1.0, 1.0, 1.0, 0.0, 1.0, 1.0)
 
 
 class ImageOpsColorAjust:
@@ -28,9 +27,20 @@ class ImageOpsColorAjust:
             "optional": {
                 "video": ("IMAGE", {"tooltip": "Video frames (alias for image input)", "forceInput": True}),
                 "mask": ("MASK",),
+                "engine": (["direct", "lut_33", "lut_65"], {
+                    "default": "direct",
+                    "tooltip": "lut_*: bake all adjustments into a cached 3D LUT and apply one trilinear lookup",
+                }),
             },
         }
 
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        from ._memo import changed_signature
+
+        return changed_signature(kwargs)
+
+    @profiled
     def apply(
         self,
         image,
@@ -44,10 +54,48 @@ class ImageOpsColorAjust:
         hs_value,
         video=None,
         mask=None,
+        engine="direct",
     ):
+        from ._exec import run_batched, run_pointwise
+        from ._helpers import (
+            _apply_color_correct,
+            _apply_huesat,
+            _select_media_tensor,
+            _to_compute,
+            EPSILON,
+            FUSED_POINTWISE,
+        )
+        from ._lut import apply_color_lut, bake_alpha_curve, bake_color_lut
+        from ._memo import memoized
+
         source = _select_media_tensor(image, video)
         if bool(bypass):
             return (source,)
-        x = _apply_color_correct(source, brightness, contrast, gamma, saturation)
-        x = _apply_huesat(x, hue_deg, hs_saturation, hs_value)
-        return (_apply_mask_to_image(source, x, mask),)
+        params = (brightness, contrast, gamma, saturation, hue_deg, hs_saturation, hs_value)
+        if all(abs(float(p) - n) <= EPSILON for p, n in zip(params, _NEUTRAL)):
+            # neutral settings: the adjustments reduce to the [0,1] clamp in compute dtype
+            return (run_batched(lambda t: _to_compute(t).clamp(0, 1), source, mask=mask, work_factor=2, halo=0),)
+
+        lut_size = _LUT_SIZES.get(str(engine))
+        if lut_size is not None:
+            lut = bake_color_lut(params, lut_size, source.device)
+            alpha = bake_alpha_curve(params, source.device) if source.shape[-1] == 4 else None
+
+            def op(t):
+                return apply_color_lut(t, lut, alpha)
+
+            work = 4
+        else:
+            def op(t):
+                t = _apply_color_correct(t, brightness, contrast, gamma, saturation)
+                return _apply_huesat(t, hue_deg, hs_saturation, hs_value)
+
+            # HSV round trip keeps about a dozen full-size temporaries alive
+            work = 16
+
+        def compute():
+            if FUSED_POINTWISE:
+                return run_pointwise(op, source, mask=mask)
+            return run_batched(op, source, mask=mask, work_factor=work, halo=0)
+
+        return (memoized("color_ajust", params + (str(engine),), compute, source, mask),)
@@ -1,4 +1,4 @@
-from ._helpers import _apply_invert, _apply_mask_to_image, _select_media_tensor
+from ._profiling import profiled
 
 class ImageOpsInvert:
     CATEGORY = "image/imageops"
@@ -19,10 +19,22 @@ class ImageOpsInvert:
             }
         }
 
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        from ._memo import changed_signature
+
+        return changed_signature(kwargs)
+
+    @profiled
     def apply(self, image=None, bypass=False, invert_alpha=False, video=None, mask=None):
+        from ._exec import run_batched, run_pointwise
+        from ._helpers import _apply_invert, _select_media_tensor, FUSED_POINTWISE
+
         src = _select_media_tensor(image, video)
         if bool(bypass):
             return (src,)
-        out = _apply_invert(src, invert_alpha=bool(invert_alpha))
-        out = _apply_mask_to_image(src, out, mask)
+        if FUSED_POINTWISE:
+            return (run_pointwise(lambda t: _apply_invert(t, invert_alpha=bool(invert_alpha)), src, mask=mask),)
+        out = run_batched(lambda t: _apply_invert(t, invert_alpha=bool(invert_alpha)), src, mask=mask, work_factor=3,
+                          halo=0)
         return (out,)
@@ -0,0 +1,47 @@
+from ._profiling import phase, profiled
+
+
+class ImageOpsLoadSequence:
+    """
+    Image-sequence loader: decodes the selected frames of a directory on a thread pool straight into one
+    [B,H,W,C] batch. Decoded frames are cached (path + mtime) so re-runs and overlapping ranges skip decoding.
+    """
+    CATEGORY = "image/imageops"
+    RETURN_TYPES = ("IMAGE", "INT")
+    RETURN_NAMES = ("images", "frame_count")
+    FUNCTION = "load"
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "directory": ("STRING", {
+                    "default": "",
+                    "tooltip": "Folder of frames, relative to ComfyUI's input directory (absolute paths must be inside "
+                               "the input/output directories or IMAGEOPS_SEQUENCE_ROOTS)",
+                }),
+                "pattern": ("STRING", {"default": "*", "tooltip": "Filename glob, e.g. shot010_*.png"}),
+                "start": ("INT", {"default": 0, "min": 0, "max": 1000000, "step": 1}),
+                "count": ("INT", {"default": 0, "min": 0, "max": 1000000, "step": 1, "tooltip": "0 = all"}),
+                "stride": ("INT", {"default": 1, "min": 1, "max": 1000, "step": 1}),
+            },
+        }
+
+    @classmethod
+    def IS_CHANGED(cls, directory, pattern="*", start=0, count=0, stride=1, **kwargs):
+        from ._sequence import list_frames, resolve_directory, select_frames, sequence_signature
+
+        try:
+            paths = select_frames(list_frames(resolve_directory(directory), pattern), start, count, stride)
+            return sequence_signature(paths)
+        except (OSError, ValueError):
+            return float("nan")  # unreadable: always re-run (the load reports the error)
+
+    @profiled
+    def load(self, directory, pattern="*", start=0, count=0, stride=1):
+        from ._sequence import list_frames, load_sequence, resolve_directory, select_frames
+
+        paths = select_frames(list_frames(resolve_directory(directory), pattern), start, count, stride)
+        with phase("decode"):
+            images, stats = load_sequence(paths)
+        return {"ui": {"imageops_sequence": [stats]}, "result": (images, int(images.shape[0]))}
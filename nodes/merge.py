@@ -1,4 +1,4 @@
-from ._helpers import _apply_merge, _apply_mask_to_image
+from ._profiling import profiled
 
 class ImageOpsMerge:
     CATEGORY = "image/imageops"
@@ -20,9 +20,26 @@ class ImageOpsMerge:
             }
         }
 
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        from ._memo import changed_signature
+
+        return changed_signature(kwargs)
+
+    @profiled
     def apply(self, A, B, bypass=False, mode="over", mix=1.0, mask=None):
+        from ._exec import run_batched, run_pointwise
+        from ._helpers import _apply_merge, _to_compute, EPSILON, FUSED_POINTWISE
+
         if bool(bypass):
             return (A,)
-        out = _apply_merge(A, B, mode, mix)
-        out = _apply_mask_to_image(A, out, mask)
-        return (out,)
+        # mix 0 keeps A's color (clamped, in compute dtype); only "over" with two alpha channels still changes
+        # A's alpha, and a longer B still sets the output batch
+        if float(mix) <= EPSILON and B.shape[0] in (1, A.shape[0]) \
+                and not (str(mode).lower() == "over" and A.shape[-1] == 4 and B.shape[-1] == 4):
+            return (run_batched(lambda a: _to_compute(a).clamp(0, 1), A, mask=mask, work_factor=2, halo=0),)
+
+        # Not memoized: hashing A and B costs more than the blend itself.
+        if FUSED_POINTWISE and A.shape[1:3] == B.shape[1:3] and B.shape[0] in (1, A.shape[0]):
+            return (run_pointwise(lambda a, b: _apply_merge(a, b, mode, mix), A, B, mask=mask),)
+        return (run_batched(lambda a, b: _apply_merge(a, b, mode, mix), A, B, mask=mask, work_factor=8, halo=0),)
@@ -1,4 +1,5 @@
-from ._preview import save_temp_images, save_temp_animated, save_temp_strip
+from . import _preview_store  # noqa: F401  (registers the in-memory preview route while the server accepts routes)
+from ._profiling import phase, profiled
 
 
 class ImageOpsPreview:
@@ -6,6 +7,7 @@ class ImageOpsPreview:
     Output-only preview node, similar to ComfyUI's PreviewImage, but tuned for IMAGE batches:
     - images: emits individual previews
     - animated_webp / animated_gif: emits a single animated preview for sequences
+    Optionally computes exact scope bins (histogram/waveform/vectorscope) over the whole batch for Preview Pro.
     """
     CATEGORY = "image/imageops"
     RETURN_TYPES = ()
@@ -18,19 +20,64 @@ class ImageOpsPreview:
             "required": {
                 "image": ("IMAGE",),
                 "mode": (["images", "strip", "animated_webp", "animated_gif"], {"default": "images"}),
-            }
+            },
+            "optional": {
+                "compression": (["default", "fast"], {
+                    "default": "default",
+                    "tooltip": "fast: lowest PNG/WEBP compression effort (bigger temp files, much faster encode)",
+                }),
+                "max_size": ("INT", {
+                    "default": 0, "min": 0, "max": 8192, "step": 8,
+                    "tooltip": "Animated modes: cap the longest edge of preview frames (0 = full resolution)",
+                }),
+                "strip_sampling": (["first", "even"], {
+                    "default": "first",
+                    "tooltip": "Strip mode: first 16 frames, or 16 frames evenly spaced across the sequence",
+                }),
+                "scopes": (["off", "batch", "per_frame"], {
+                    "default": "off",
+                    "tooltip": "Compute histogram/waveform/vectorscope bins server-side over every full-resolution "
+                               "frame (batch aggregate; per_frame also sends each frame's bins and follows the frame "
+                               "selected in the gallery)",
+                }),
+            },
         }
 
-    def preview(self, image, mode="images"):
+    @profiled
+    def preview(self, image, mode="images", compression="default", max_size=0, strip_sampling="first",
+                scopes="off"):
+        from ._preview import (
+            enforce_temp_quota,
+            preview_cache,
+            preview_ui,
+            save_temp_animated,
+            save_temp_images,
+            save_temp_strip,
+        )
+        from ._scopes import scopes_payload
+
+        opts = {"prefix": "imageops_preview", "compression": compression}
+        # Identical input + options -> same file names, so a re-run reuses the encoded previews.
+        extra = (strip_sampling,) if mode == "strip" else (max_size,) if mode.startswith("animated") else ()
+        # Each saver keys the cache on the uint8 data it encodes (full batch, strip or downscaled windows).
+        cache = preview_cache(image, mode, compression, *extra)
         if mode == "strip":
-            item = save_temp_strip(image, prefix="imageops_preview", ext="png")
-            ui = {"images": [item]} if item else {"images": save_temp_images(image, prefix="imageops_preview")}
+            items = [save_temp_strip(image, ext="png", sampling=strip_sampling, cache=cache, **opts)]
         elif mode == "animated_webp":
-            item = save_temp_animated(image, prefix="imageops_preview", ext="webp")
-            ui = {"images": [item]} if item else {"images": save_temp_images(image, prefix="imageops_preview")}
+            items = [save_temp_animated(image, ext="webp", max_size=max_size, cache=cache, **opts)]
         elif mode == "animated_gif":
-            item = save_temp_animated(image, prefix="imageops_preview", ext="gif")
-            ui = {"images": [item]} if item else {"images": save_temp_images(image, prefix="imageops_preview")}
+            items = [save_temp_animated(image, ext="gif", max_size=max_size, cache=cache, **opts)]
         else:
-            ui = {"images": save_temp_images(image, prefix="imageops_preview")}
+            items = []
+        if not any(items):
+            items = save_temp_images(image, cache=preview_cache(image, "images", compression), **opts)
+        # temp files under "images"; in-memory previews (IMAGEOPS_PREVIEW_MEMORY) under their own key
+        ui = preview_ui(items)
+        with phase("temp_quota"):
+            enforce_temp_quota(keep=[item["filename"] for item in items if item])
+        if scopes in ("batch", "per_frame"):
+            with phase("scopes"):
+                payload = scopes_payload(image, per_frame=scopes == "per_frame")
+            if payload:
+                ui["imageops_scopes"] = [payload]
         return {"ui": ui}
@@ -0,0 +1,97 @@
+import os
+
+from ._profiling import phase, profiled
+from ._writer import FORMATS, WRITER, extension
+
+
+def _output_directory(directory, filename_prefix):
+    """
+    Target folder inside ComfyUI's output directory (same containment rule as `folder_paths.get_save_image_path`).
+    `directory` is relative to it, or absolute within it; `filename_prefix` must be a plain file name.
+    """
+    import folder_paths
+
+    root = os.path.abspath(folder_paths.get_output_directory())
+    target = os.path.abspath(os.path.join(root, str(directory).strip()))
+    if os.path.commonpath((root, target)) != root:
+        raise ValueError(f"Save directory '{directory}' is outside the output directory {root}")
+    prefix = str(filename_prefix)
+    if not prefix.strip() or "/" in prefix or "\\" in prefix:
+        raise ValueError(f"filename_prefix '{filename_prefix}' must be a file name, not a path")
+    os.makedirs(target, exist_ok=True)
+    return target
+
+
+class ImageOpsSaveSequence:
+    """
+    Output node: writes a batch to numbered image files (PNG/TIFF/WEBP) or one .npy stack. The batch is
+    quantized to uint8 in one pass, then encoded on a background writer pool, so the next prompt can start
+    computing while files are still being written (`wait` blocks until they are on disk).
+    """
+    CATEGORY = "image/imageops"
+    RETURN_TYPES = ()
+    FUNCTION = "save"
+    OUTPUT_NODE = True
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "images": ("IMAGE",),
+                "directory": ("STRING", {
+                    "default": "imageops_sequence",
+                    "tooltip": "Target folder inside ComfyUI's output directory (relative to it)",
+                }),
+                "filename_prefix": ("STRING", {"default": "frame"}),
+                "format": (list(FORMATS), {"default": "png"}),
+                "compression": (["default", "fast", "max"], {
+                    "default": "default",
+                    "tooltip": "fast: PNG level 1 / WEBP method 0 / raw TIFF; max: PNG level 9 / deflate TIFF",
+                }),
+                "start_number": ("INT", {"default": 0, "min": 0, "max": 10000000, "step": 1}),
+                "padding": ("INT", {"default": 5, "min": 1, "max": 10, "step": 1}),
+            },
+            "optional": {
+                "quality": ("INT", {"default": 95, "min": 1, "max": 100, "step": 1,
+                                    "tooltip": "WEBP quality (100 = lossless)"}),
+                "overwrite": ("BOOLEAN", {"default": False}),
+                "wait": ("BOOLEAN", {"default": False, "tooltip": "Block until every file is written"}),
+            },
+        }
+
+    @profiled
+    def save(self, images, directory="imageops_sequence", filename_prefix="frame", format="png",
+             compression="default", start_number=0, padding=5, quality=95, overwrite=False, wait=False):
+        from ._helpers import _tensor_batch_to_uint8
+        from ._spill import is_spilled
+
+        fmt = str(format).lower()
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format: {format}")
+        out_dir = _output_directory(directory, filename_prefix)
+        ext = extension(fmt)
+        names = [f"{filename_prefix}_{int(start_number) + i:0{int(padding)}d}.{ext}"
+                 for i in range(1 if fmt == "npy" else int(images.shape[0]))]
+        paths = [os.path.join(out_dir, n) for n in names]
+        if not overwrite:
+            existing = [n for n, p in zip(names, paths) if os.path.exists(p)]
+            if existing:
+                raise FileExistsError(f"{len(existing)} file(s) already exist in {out_dir} (first: {existing[0]})")
+
+        if is_spilled(images) and fmt != "npy":
+            # Quantize frame by frame as the writer drains: the batch never has to fit in memory, even as uint8.
+            items = ((_tensor_batch_to_uint8(images[i:i + 1])[0], p) for i, p in enumerate(paths))
+            with phase("queue"):
+                job = WRITER.submit(items, out_dir, fmt, compression, quality, total=len(paths))
+        else:
+            with phase("quantize"):
+                arr = _tensor_batch_to_uint8(images)
+            items = [(arr, paths[0])] if fmt == "npy" else [(arr[i], paths[i]) for i in range(arr.shape[0])]
+            with phase("queue"):
+                job = WRITER.submit(items, out_dir, fmt, compression, quality)
+        if wait:
+            with phase("write"):
+                job.done.wait()
+            if job.errors:
+                raise RuntimeError(f"ImageOps writer: {len(job.errors)} file(s) failed, first: {job.errors[0]}")
+        return {"ui": {"imageops_write": [job.stats()]}}
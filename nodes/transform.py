@@ -1,15 +1,5 @@
-from PIL import Image
-
-from ._helpers import (
-    _apply_mask_to_image,
-    _pil_to_tensor,
-    _select_media_tensor,
-    _tensor_to_pil,
-    EPSILON,
-    LARGE_IMAGE_WARN_MB,
-    MAX_SCALE_DIMENSION,
-    logger,
-)
+from ._layout import HIDDEN_INPUTS, hand_off
+from ._profiling import profiled
 
 
 class ImageOpsTransform:
@@ -33,52 +23,40 @@ class ImageOpsTransform:
             "optional": {
                 "video": ("IMAGE", {"tooltip": "Video frames (alias for image input)", "forceInput": True}),
                 "mask": ("MASK",),
-            }
+            },
+            "hidden": HIDDEN_INPUTS,
         }
 
-    def apply(self, image, bypass, translate_x, translate_y, rotate_deg, scale, filter, expand, video=None, mask=None):
-        source = _select_media_tensor(image, video)
-        if bool(bypass):
-            return (source,)
-        pil = _tensor_to_pil(source)
-
-        resample = {
-            "nearest": Image.NEAREST,
-            "bilinear": Image.BILINEAR,
-            "bicubic": Image.BICUBIC,
-        }.get(filter, Image.BILINEAR)
-
-        if abs(scale - 1.0) > EPSILON:
-            w, h = pil.size
-            nw, nh = max(1, int(round(w * scale))), max(1, int(round(h * scale)))
-            if nw > MAX_SCALE_DIMENSION or nh > MAX_SCALE_DIMENSION:
-                logger.error(f"Scaled dimensions ({nw}x{nh}) exceed maximum ({MAX_SCALE_DIMENSION}x{MAX_SCALE_DIMENSION})")
-                raise ValueError(
-                    f"Resulting image size ({nw}x{nh}) would exceed maximum allowed dimensions "
-                    f"({MAX_SCALE_DIMENSION}x{MAX_SCALE_DIMENSION}). "
-                    f"Original: {w}x{h}, Scale: {scale:.2f}"
-                )
-
-            estimated_mb = (nw * nh * 4) / (1024 * 1024)
-            if estimated_mb > float(LARGE_IMAGE_WARN_MB):
-                logger.warning(f"Large image allocation: {nw}x{nh} (~{estimated_mb:.1f} MB) > {LARGE_IMAGE_WARN_MB} MB")
-
-            pil = pil.resize((nw, nh), resample=resample)
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        from ._memo import changed_signature
 
-        if abs(rotate_deg) > EPSILON:
-            pil = pil.rotate(rotate_deg, resample=resample, expand=bool(expand))
-            if expand:
-                w, h = pil.size
-                if w > MAX_SCALE_DIMENSION or h > MAX_SCALE_DIMENSION:
-                    logger.error(f"Rotated dimensions with expand ({w}x{h}) exceed maximum")
-                    raise ValueError(f"Rotated image size ({w}x{h}) exceeds maximum ({MAX_SCALE_DIMENSION}x{MAX_SCALE_DIMENSION})")
+        return changed_signature(kwargs)
 
-        if translate_x != 0 or translate_y != 0:
-            mode = pil.mode
-            bg = (0, 0, 0, 0) if mode == "RGBA" else (0, 0, 0)
-            canvas = Image.new(mode, pil.size, bg)
-            canvas.paste(pil, (translate_x, translate_y))
-            pil = canvas
+    @profiled
+    def apply(self, image, bypass, translate_x, translate_y, rotate_deg, scale, filter, expand, video=None, mask=None,
+              prompt=None, unique_id=None):
+        from ._exec import run_batched
+        from ._helpers import _apply_transform, _select_media_tensor, EPSILON
+        from ._memo import memoized
 
-        processed = _pil_to_tensor(pil)
-        return (_apply_mask_to_image(source, processed, mask),)
+        source = _select_media_tensor(image, video)
+        if bool(bypass):
+            return (hand_off(source, prompt, unique_id),)
+        if int(translate_x) == 0 and int(translate_y) == 0 and abs(float(rotate_deg)) <= EPSILON \
+                and abs(float(scale) - 1.0) <= EPSILON:
+            return (hand_off(source, prompt, unique_id),)
+        # input frame + resampled output (scale^2 larger, up to 2x more with expand) and its layout copy
+        work = 2.0 + 2.0 * max(1.0, float(scale)) ** 2 * (2.0 if expand else 1.0)
+        return (hand_off(memoized(
+            "transform",
+            (int(translate_x), int(translate_y), float(rotate_deg), float(scale), str(filter), bool(expand)),
+            lambda: run_batched(
+                lambda t: _apply_transform(t, translate_x, translate_y, rotate_deg, scale, filter, expand),
+                source,
+                mask=mask,
+                work_factor=work,
+            ),
+            source,
+            mask,
+        ), prompt, unique_id),)
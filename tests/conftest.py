@@ -0,0 +1,13 @@
+"""
+Tests load the `nodes` package outside ComfyUI through the bench harness (synthetic package namespace,
+stubbed `folder_paths`, memoization off).
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "bench"))
+
+from _common import load_nodes  # noqa: E402
+
+load_nodes()
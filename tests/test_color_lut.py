@@ -0,0 +1,36 @@
+import pytest
+import torch
+
+from _common import load
+
+color_ajust = load("color_ajust")
+
+PARAMS = [
+    dict(brightness=0.2, contrast=1.0, gamma=1.0, saturation=1.0, hue_deg=0.0, hs_saturation=1.0, hs_value=1.0),
+    dict(brightness=-0.1, contrast=1.3, gamma=2.2, saturation=1.2, hue_deg=15.0, hs_saturation=1.1, hs_value=0.95),
+    dict(brightness=0.05, contrast=0.8, gamma=0.5, saturation=0.7, hue_deg=-40.0, hs_saturation=1.0, hs_value=1.1),
+]
+
+
+def _apply(image, engine, params):
+    return color_ajust.ImageOpsColorAjust().apply(image=image, bypass=False, engine=engine, **params)[0]
+
+
+@pytest.mark.parametrize("engine", ["lut_33", "lut_65"])
+@pytest.mark.parametrize("params", PARAMS)
+def test_lut_matches_direct_on_rgba(engine, params):
+    torch.manual_seed(0)
+    image = torch.rand(2, 24, 32, 4)
+    direct = _apply(image, "direct", params)
+    lut = _apply(image, engine, params)
+    assert lut.shape == direct.shape
+    # alpha goes through the same brightness/contrast/gamma as the direct ops (fine 1D curve)
+    assert (lut[..., 3] - direct[..., 3]).abs().max().item() < 1e-3
+    assert (lut[..., :3] - direct[..., :3]).abs().mean().item() < 3e-3
+
+
+def test_lut_brightens_alpha_like_direct():
+    image = torch.full((1, 4, 4, 4), 0.5)
+    params = dict(PARAMS[0])
+    for engine in ("direct", "lut_33", "lut_65"):
+        assert _apply(image, engine, params)[..., 3].mean().item() == pytest.approx(0.7, abs=1e-6)
@@ -0,0 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+
+from _common import load
+
+h = load("_helpers")
+
+
+def test_kernel_cache_is_thread_safe():
+    # More distinct keys than the cache holds, so lookups, inserts and evictions interleave across threads.
+    keys = [(r, 0.5 + r / 4.0) for r in range(1, 3 * h._KERNEL_CACHE_SIZE)]
+
+    def lookups(offset):
+        for i in range(400):
+            radius, sigma = keys[(i * 7 + offset) % len(keys)]
+            k = h._cached_gaussian_kernel1d(radius, sigma, torch.device("cpu"))
+            assert k.numel() == 2 * radius + 1
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lookups, range(8)))
+    assert len(h._KERNEL_CACHE) <= h._KERNEL_CACHE_SIZE
@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+import folder_paths
+import numpy as np
+import pytest
+import torch
+from PIL import Image, ImageOps
+
+from _common import load
+
+seq = load("_sequence")
+load_sequence = load("load_sequence")
+
+
+def _write_frames(directory, count=3, size=(6, 4), exif=None):
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(0)
+    for i in range(count):
+        img = Image.fromarray(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8))
+        img.save(os.path.join(directory, f"frame_{i}.png"), **({"exif": exif} if exif else {}))
+
+
+def _load(directory):
+    return load_sequence.ImageOpsLoadSequence().load(directory)["result"][0]
+
+
+def test_relative_directory_under_input():
+    _write_frames(os.path.join(folder_paths.get_input_directory(), "seq_in"))
+    assert tuple(_load("seq_in").shape) == (3, 4, 6, 3)
+
+
+@pytest.mark.parametrize("directory", ["..", "../elsewhere", "seq_in/../../elsewhere"])
+def test_escape_is_rejected(directory):
+    with pytest.raises(ValueError, match="outside"):
+        seq.resolve_directory(directory)
+
+
+def test_absolute_directory_needs_an_allowed_root(monkeypatch):
+    outside = tempfile.mkdtemp(prefix="imageops_roots_")
+    _write_frames(outside, count=2)
+    with pytest.raises(ValueError, match="IMAGEOPS_SEQUENCE_ROOTS"):
+        _load(outside)
+    assert load_sequence.ImageOpsLoadSequence.IS_CHANGED(outside) != load_sequence.ImageOpsLoadSequence.IS_CHANGED(outside)
+    monkeypatch.setattr(seq, "SEQUENCE_ROOTS", [outside])
+    assert _load(outside).shape[0] == 2
+
+
+def test_exif_orientation_is_applied_like_load_image():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotate 90 degrees clockwise on display
+    directory = os.path.join(folder_paths.get_output_directory(), "seq_exif")
+    _write_frames(directory, count=2, size=(6, 4), exif=exif)
+    images = _load(directory)
+    assert tuple(images.shape) == (2, 6, 4, 3)
+    with Image.open(os.path.join(directory, "frame_1.png")) as img:
+        expected = np.asarray(ImageOps.exif_transpose(img).convert("RGB"), dtype=np.float32) / 255.0
+    assert torch.equal(images[1], torch.from_numpy(expected))
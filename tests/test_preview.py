@@ -0,0 +1,63 @@
+import pytest
+import torch
+
+from _common import load
+
+pv = load("_preview")
+preview = load("preview")
+
+
+@pytest.fixture
+def conversions(monkeypatch):
+    """Shape of every batch handed to the uint8 converter."""
+    calls = []
+    convert = pv._tensor_batch_to_uint8
+
+    def counted(images, *args, **kwargs):
+        calls.append(tuple(images.shape))
+        return convert(images, *args, **kwargs)
+
+    monkeypatch.setattr(pv, "_tensor_batch_to_uint8", counted)
+    return calls
+
+
+def test_images_miss_converts_once_and_rerun_reuses(conversions):
+    image = torch.rand(3, 24, 32, 3)
+    node = preview.ImageOpsPreview()
+    first = node.preview(image, mode="images")["ui"]
+    assert conversions == [(3, 24, 32, 3)]
+    second = node.preview(image, mode="images")["ui"]
+    assert second == first
+    assert len(conversions) == 2  # the key needs the converted batch; nothing is encoded again
+
+
+def test_strip_converts_only_the_strip(conversions):
+    image = torch.rand(20, 48, 64, 3)
+    node = preview.ImageOpsPreview()
+    first = node.preview(image, mode="strip")["ui"]
+    assert node.preview(image, mode="strip")["ui"] == first
+    assert all(shape[0] == 1 and shape[1] == 256 for shape in conversions)
+
+
+def test_animated_max_size_streams_downscaled_windows(conversions, monkeypatch):
+    monkeypatch.setattr(pv, "_STREAM_WINDOW_BYTES", 4 * 16 * 12 * 3)  # 4 downscaled frames per window
+    image = torch.rand(10, 48, 64, 3)
+    node = preview.ImageOpsPreview()
+    first = node.preview(image, mode="animated_webp", max_size=16)["ui"]
+    assert node.preview(image, mode="animated_webp", max_size=16)["ui"] == first
+    assert conversions and all(shape[0] <= 4 and shape[1:3] == (12, 16) for shape in conversions)
+
+
+def test_animated_full_resolution_streams_windows(conversions, monkeypatch):
+    monkeypatch.setattr(pv, "_STREAM_WINDOW_BYTES", 2 * 24 * 32 * 3)
+    image = torch.rand(5, 24, 32, 3)
+    preview.ImageOpsPreview().preview(image, mode="animated_webp")
+    assert conversions and all(shape[0] <= 2 for shape in conversions)
+
+
+def test_key_ignores_sub_quantum_differences():
+    image = torch.randint(0, 256, (2, 16, 16, 3)).float() / 255.0
+    nudged = image + 1e-3 * (0.5 - image).sign()  # < half a uint8 step
+    key = pv.preview_key([pv._tensor_batch_to_uint8(image)], "images")
+    assert key == pv.preview_key([pv._tensor_batch_to_uint8(nudged)], "images")
+    assert key != pv.preview_key([pv._tensor_batch_to_uint8(image)], "strip")
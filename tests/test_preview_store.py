@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from _common import load
+
+pytest.importorskip("aiohttp")  # ComfyUI's server dependency
+store = load("_preview_store")
+
+
+def _serve(requests):
+    """Run `requests(client)` against an aiohttp app that only has the ImageOps preview route."""
+    from aiohttp import web
+    from aiohttp.test_utils import TestClient, TestServer
+
+    async def main():
+        routes = web.RouteTableDef()
+        store.register_routes(routes)
+        app = web.Application()
+        app.add_routes(routes)
+        async with TestClient(TestServer(app)) as client:
+            return await requests(client)
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def small_store(monkeypatch):
+    monkeypatch.setattr(store, "STORE", store.PreviewStore(16))
+    return store.STORE
+
+
+def test_route_serves_hit_then_404_after_eviction(small_store):
+    small_store.put("imageops_preview_a_000.png", b"png-bytes")
+
+    async def requests(client):
+        hit = await client.get("/imageops/preview/imageops_preview_a_000.png")
+        first = (hit.status, hit.headers["Content-Type"], await hit.read())
+        small_store.put("imageops_preview_b.webp", b"webp-bytes")  # 9 + 10 bytes > 16: evicts the PNG
+        gone = await client.get("/imageops/preview/imageops_preview_a_000.png")
+        second = await client.get("/imageops/preview/imageops_preview_b.webp")
+        return first, (gone.status, await gone.text()), (second.status, second.headers["Content-Type"])
+
+    first, gone, second = _serve(requests)
+    assert first == (200, "image/png", b"png-bytes")
+    assert gone == (404, "preview expired or unknown")
+    assert second == (200, "image/webp")
+
+
+def test_route_unknown_name_is_404(small_store):
+    async def requests(client):
+        resp = await client.get("/imageops/preview/never_stored.gif")
+        return resp.status
+
+    assert _serve(requests) == 404
@@ -0,0 +1,38 @@
+import os
+
+import folder_paths
+import pytest
+import torch
+
+from _common import load
+
+save_sequence = load("save_sequence")
+
+
+def _save(**kwargs):
+    return save_sequence.ImageOpsSaveSequence().save(torch.rand(2, 8, 8, 3), wait=True, overwrite=True, **kwargs)
+
+
+def test_writes_under_output_directory():
+    stats = _save(directory="seq_test", filename_prefix="shot")["ui"]["imageops_write"][0]
+    root = folder_paths.get_output_directory()
+    assert os.path.exists(os.path.join(root, "seq_test", "shot_00000.png"))
+    assert stats["files"] == 2
+
+
+def test_absolute_path_inside_output_directory():
+    target = os.path.join(folder_paths.get_output_directory(), "abs_inside")
+    _save(directory=target, filename_prefix="f")
+    assert os.path.exists(os.path.join(target, "f_00000.png"))
+
+
+@pytest.mark.parametrize("directory", ["..", "../escape", "seq/../../escape", "/tmp/imageops_escape"])
+def test_directory_escape_is_rejected(directory):
+    with pytest.raises(ValueError, match="outside the output directory"):
+        _save(directory=directory)
+
+
+@pytest.mark.parametrize("prefix", ["../frame", "sub/frame", "..\\frame", ""])
+def test_prefix_with_path_is_rejected(prefix):
+    with pytest.raises(ValueError, match="filename_prefix"):
+        _save(directory="seq_test", filename_prefix=prefix)
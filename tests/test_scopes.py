@@ -0,0 +1,33 @@
+import base64
+
+import numpy as np
+import torch
+
+from _common import load
+
+scopes = load("_scopes")
+
+
+def _decode(b64):
+    return np.frombuffer(base64.b64decode(b64), dtype="<u4").tolist()
+
+
+def test_per_frame_payload_is_capped_and_compact(monkeypatch):
+    monkeypatch.setattr(scopes, "SCOPES_MAX_FRAMES", 2)
+    images = torch.rand(5, 8, 12, 3)
+    payload = scopes.scopes_payload(images, per_frame=True)
+    assert payload["frames"] == 5
+    assert payload["per_frame_encoding"] == "base64_uint32le"
+    assert len(payload["per_frame"]) == 2
+    bins = scopes.compute_scopes(images)
+    for name in ("hist", "waveform", "waveform_r", "vectorscope"):
+        assert _decode(payload["per_frame"][1][name]) == bins[name][1].tolist()
+    assert payload["aggregate"]["hist"] == bins["hist"].sum(0).tolist()
+
+
+def test_default_cap_is_small():
+    assert scopes.SCOPES_MAX_FRAMES <= 8
+
+
+def test_batch_payload_has_no_per_frame():
+    assert "per_frame" not in scopes.scopes_payload(torch.rand(2, 8, 8, 3))
@@ -0,0 +1,47 @@
+import pytest
+import torch
+
+from _common import load
+
+ex = load("_exec")
+h = load("_helpers")
+blur = load("blur")
+
+
+@pytest.fixture
+def tiles(monkeypatch):
+    monkeypatch.setattr(ex, "TILE_SIZE", 64)
+    monkeypatch.setattr(ex, "CPU_WORKERS", 1)
+
+
+def _blur(image, radius, sigma, mask=None):
+    return blur.ImageOpsBlur().apply(image, False, radius, sigma, mask=mask)[0]
+
+
+@pytest.mark.parametrize("radius", [4, 12, 20])
+def test_tiled_blur_is_bit_identical(tiles, radius):
+    torch.manual_seed(0)
+    image = torch.rand(2, 150, 170, 3)
+    tiled = _blur(image, radius, radius / 2.0)
+    whole = h._apply_blur(image, radius, radius / 2.0, fft=False)
+    assert torch.equal(tiled, whole)
+
+
+def test_masked_roi_blur_matches_full_frame(monkeypatch):
+    monkeypatch.setattr(ex, "TILE_SIZE", 0)
+    torch.manual_seed(1)
+    image = torch.rand(1, 96, 96, 3)
+    mask = torch.zeros(1, 96, 96)
+    mask[:, 10:30, 40:60] = 1.0
+    roi = _blur(image, 16, 8.0, mask=mask)
+    whole = h._blend_with_mask(image, h._apply_blur(image, 16, 8.0, fft=False), mask)
+    assert torch.equal(roi, whole)
+
+
+def test_whole_frame_blur_keeps_fft(monkeypatch):
+    monkeypatch.setattr(ex, "TILE_SIZE", 0)
+    image = torch.rand(1, 48, 40, 3)
+    assert not ex.crops_frames(image)
+    out = _blur(image, 16, 8.0)
+    assert torch.equal(out, h._apply_blur(image, 16, 8.0))
+    assert (out - h._apply_blur(image, 16, 8.0, fft=False)).abs().max().item() < 1e-5
@@ -0,0 +1,36 @@
+import pytest
+import torch
+from PIL import Image
+
+from _common import load
+
+helpers = load("_helpers")
+
+
+def _pil_resize(frame, scale, filter):
+    pil = helpers._tensor_to_pil(frame)
+    resample = {"bilinear": Image.BILINEAR, "bicubic": Image.BICUBIC}[filter]
+    w, h = pil.size
+    return helpers._pil_to_tensor(pil.resize((round(w * scale), round(h * scale)), resample=resample))
+
+
+@pytest.mark.parametrize("filter", ["bilinear", "bicubic"])
+@pytest.mark.parametrize("scale", [0.5, 0.25])
+def test_downscale_matches_pil(filter, scale):
+    torch.manual_seed(0)
+    image = torch.rand(1, 96, 128, 3)  # per-pixel noise: all energy above the new Nyquist limit
+    out = helpers._apply_transform(image, 0, 0, 0.0, scale, filter=filter)
+    ref = _pil_resize(image, scale, filter)
+    assert out.shape == ref.shape
+    diff = (out - ref).abs()
+    # PIL works on uint8: the remaining error is its quantization.
+    assert diff.mean().item() < 3e-3
+    assert diff.max().item() < 2e-2
+
+
+def test_downscale_keeps_batch_and_dtype():
+    image = torch.rand(3, 40, 50, 4)
+    out = helpers._apply_transform(image, 3, -2, 10.0, 0.5, filter="bilinear", expand=True)
+    assert out.shape[0] == 3 and out.shape[-1] == 4
+    assert out.dtype == helpers._to_compute(image).dtype
+    assert 0.0 <= out.min().item() and out.max().item() <= 1.0